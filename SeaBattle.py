@@ -1,6 +1,57 @@
-from random import randint, shuffle
+import heapq
+import random
+import re
+import time
+from collections import Counter, namedtuple
 from typing import Union
 
+from instrumentation import NULL_STATS, Stats
+from renderer import ConsoleRenderer, column_label
+
+
+class _ModuleRandom:
+    """Генератор случайных чисел по умолчанию - общий генератор модуля random (random.seed влияет на партии).
+    В отличие от самого модуля его можно копировать и сериализовать вместе с полями, стратегиями и партиями"""
+
+    def __getattr__(self, name):
+        value = getattr(random, name)
+        setattr(self, name, value)  # следующие обращения - без __getattr__
+        return value
+
+    def __reduce__(self):
+        return '_MODULE_RNG'  # при копировании и сериализации остается общий объект модуля
+
+
+_MODULE_RNG = _ModuleRandom()
+
+
+class Event(namedtuple('Event', 'kind pole coord ship value')):
+    """Событие игры для подписчиков (GamePole.subscribe, SeaBattle.subscribe):
+    kind - вид события, pole - поле, на котором оно произошло (для GAME_OVER - поле победителя),
+    coord - клетка выстрела или новые координаты начала корабля, ship - номер корабля на поле,
+    value - направление перемещения (для MOVED)"""
+
+    __slots__ = ()
+
+    MISS = 'miss'  # промах по полю pole
+    HIT = 'hit'  # попадание в корабль ship
+    SUNK = 'sunk'  # корабль ship уничтожен
+    MOVED = 'moved'  # корабль ship переместился на value клеток вдоль своей оси
+    PLACED = 'placed'  # корабли поля расставлены заново
+    GAME_OVER = 'game_over'  # все корабли соперника уничтожены
+
+
+class _Decks(list):
+    """Список палуб корабля только для чтения (снимок состояния палуб, а не хранилище попаданий)"""
+
+    __slots__ = ()
+
+    def _read_only(self, *args):
+        raise TypeError('Список палуб _cells только для чтения: попадание отмечается через ship[k] = 2')
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
 
 class Ship:
     """Класс для представления кораблей"""
@@ -8,36 +59,37 @@ class Ship:
     HORIZONTAL = 1
     VERTICAL = 2
 
+    __slots__ = ('_length', '_tp', '_x', '_y', '_is_move', '_hits', '_alive')
+
     def __init__(self, length: int, tp: int = HORIZONTAL, x: int = None, y: int = None):
+        self._check_value(length)
+        if not isinstance(tp, int) or tp not in (1, 2):
+            raise ValueError('Значение ориентации должно быть 1 или 2')
+
         self._length = length  # длина корабля
         self._tp = tp  # ориентация корабля(1 - горизонтальная, 2 - вертикальная)
-        self._x = x  # координаты начала корабля(первая палуба)
-        self._y = y
+        self.set_start_coords(x, y)  # координаты начала корабля(первая палуба)
         self._is_move = True  # возможность перемещения корабля(если не было попадания - True, иначе False)
-        self._cells = [1] * length  # список с палубами корабля(1 - попадания не было, 2 - попадание было)
+        self._hits = 0  # битовая маска палуб, в которые было попадание (бит k - палуба k)
+        self._alive = length  # количество целых палуб
 
     def __repr__(self):
         return f'({self._length}-палубный, {"Горизонтальный" if self._tp == 1 else "Вертикальный"}, ' \
                f'{"Целый" if self._is_move else "Подбитый"}, ' \
                f'x={self._x} y={self._y})'
 
-    def __setattr__(self, key, value):
-        if key in ('_x', '_y', '_length'):
-            if not isinstance(value, int) and value is not None or \
-                    isinstance(value, int) and value < 0:
-                raise TypeError('Координаты и длина должны быть целыми положительными числами')
-
-        if key == '_tp':
-            if not isinstance(value, int) or value not in (1, 2):
-                raise ValueError('Значение ориентации должно быть 1 или 2')
-
-        super().__setattr__(key, value)
+    @staticmethod
+    def _check_value(value):
+        """Метод для проверки координат и длины корабля"""
+        if not isinstance(value, int) and value is not None or \
+                isinstance(value, int) and value < 0:
+            raise TypeError('Координаты и длина должны быть целыми положительными числами')
 
     def __bool__(self):
         """Метод для проверки состояния корабля
         False - если корабль полностью уничтожен,
         True - если есть еще целые палубы"""
-        return not all(x == 2 for x in self._cells)
+        return self._alive > 0
 
     @property
     def tp(self):
@@ -64,8 +116,25 @@ class Ship:
         if type(value) == bool:
             self._is_move = value
 
+    @property
+    def _cells(self) -> list:
+        """Список с палубами корабля(1 - попадания не было, 2 - попадание было).
+        Попадания хранятся в битовой маске, поэтому список только для чтения"""
+        return _Decks(2 if self._hits >> k & 1 else 1 for k in range(self._length))
+
+    @_cells.setter
+    def _cells(self, value):
+        raise AttributeError('Список палуб _cells нельзя заменить: попадание отмечается через ship[k] = 2')
+
     def set_start_coords(self, x: int, y: int):
         """Метод для установки начальных координат корабля"""
+        self._check_value(x)
+        self._check_value(y)
+        self._x = x
+        self._y = y
+
+    def _place(self, x: int, y: int):
+        """Метод для установки начальных координат без проверки (для уже проверенных значений)"""
         self._x = x
         self._y = y
 
@@ -122,38 +191,414 @@ class Ship:
         return x < 0 or last_part_coord[0] > size - 1 or y < 0 or last_part_coord[1] > size - 1
 
     def _check_index(self, index) -> bool:
-        """Метод для проверки индекса для работы со списком _cells"""
-        return 0 <= index < len(self._cells)
+        """Метод для проверки индекса палубы"""
+        return 0 <= index < self._length
 
     def __getitem__(self, item: int) -> int:
-        """Метод для считывания значения из списка _cells по индексу item"""
+        """Метод для считывания состояния палубы с индексом item (1 - целая, 2 - подбитая)"""
         if self._check_index(item):
-            return self._cells[item]
+            return 2 if self._hits >> item & 1 else 1
 
     def __setitem__(self, key, value):
-        """Метод для записи нового значения в _cells по индексу key"""
+        """Метод для записи нового состояния палубы с индексом key"""
         if self._check_index(key) and isinstance(value, int) and value in (1, 2):
-            self._cells[key] = value
+            bit = 1 << key
+            if value == 2 and not self._hits & bit:
+                self._hits |= bit
+                self._alive -= 1
+            elif value == 1 and self._hits & bit:
+                self._hits &= ~bit
+                self._alive += 1
+
+
+class GridBoard:
+    """Хранилище игрового поля в виде массива байтов по строкам (по умолчанию).
+    Клетка (x, y) хранится в байте с номером y * size + x"""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._field = bytearray(size * size)  # 0 - вода, 1 - целая палуба, 2 - подбитая палуба
+        self._view = memoryview(self._field).toreadonly().cast('B', (size, size)) if size else None
+
+    def __getstate__(self):
+        return self._size, self._field  # memoryview не копируется, при восстановлении создается заново
+
+    def __setstate__(self, state):
+        self.__init__(state[0])
+        self._field[:] = state[1]
+
+    def clear(self):
+        """Метод для очистки поля"""
+        self._field[:] = bytes(len(self._field))
+
+    def get(self, x: int, y: int) -> int:
+        """Метод для получения значения клетки с координатами x, y"""
+        return self._field[y * self._size + x]
+
+    def set(self, x: int, y: int, value: int):
+        """Метод для записи значения в клетку с координатами x, y"""
+        self._field[y * self._size + x] = value
+
+    def put_ship(self, ship: Ship):
+        """Метод для записи палуб корабля на поле"""
+        x, y = ship.get_start_coords()
+        first = y * self._size + x
+        step = 1 if ship.tp == ship.HORIZONTAL else self._size
+        for k in range(ship.length):
+            self._field[first + step * k] = ship[k]
+
+    def check_around(self, length: int, head_coord: tuple, orientation: int) -> int:
+        """Метод для проверки наличия кораблей вокруг и на месте установки корабля"""
+        indexes = (-1, 0), (1, 0), (0, 1), (0, -1), (-1, -1), (1, -1), (-1, 1), (1, 1), (0, 0)
+        head_x, head_y = head_coord
+        size, field = self._size, self._field
+        result = 0
+
+        if orientation == 1:  # горизонтально
+            j = head_x
+            k = 0
+            while length > k:  # пока не проверили на наличие кораблей вокруг и на месте установки
+                result += sum(field[(head_y + x) * size + j + y] for x, y in indexes
+                              if 0 <= head_y + x < size and 0 <= j + y < size)
+                j += 1
+                k += 1
+
+        elif orientation == 2:  # вертикально
+            i = head_y
+            k = 0
+            while length > k:  # пока не проверили на наличие кораблей вокруг и на месте установки
+                result += sum(field[(i + x) * size + head_x + y] for x, y in indexes
+                              if 0 <= i + x < size and 0 <= head_x + y < size)
+                i += 1
+                k += 1
+
+        return result
+
+    def is_empty(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Метод для проверки отсутствия палуб в прямоугольнике от (x0, y0) до (x1, y1) включительно"""
+        size, field = self._size, self._field
+        if y0 == y1:  # одна строка или один столбец - один срез
+            return not any(field[y0 * size + x0:y0 * size + x1 + 1])
+        if x0 == x1:
+            return not any(field[y0 * size + x0:y1 * size + x0 + 1:size])
+        return not any(any(field[y * size + x0:y * size + x1 + 1]) for y in range(y0, y1 + 1))
+
+    def rows(self) -> tuple:
+        """Метод для получения поля в виде кортежа строк"""
+        size = self._size
+        return tuple(tuple(self._field[i:i + size]) for i in range(0, size * size, size))
+
+    def view(self) -> memoryview:
+        """Метод для получения представления поля только для чтения без копирования: view[y, x]"""
+        return self._view if self._view is not None else BoardView(self, 0)
+
+
+class BoardView:
+    """Представление поля только для чтения без копирования для хранилищ без общего буфера.
+    Как и memoryview поля GridBoard: view[y, x] - значение клетки, shape - (size, size), tolist() - список строк"""
+
+    __slots__ = ('_board', 'shape')
+
+    def __init__(self, board, size: int):
+        self._board = board
+        self.shape = size, size
+
+    def __getitem__(self, index: tuple) -> int:
+        y, x = index
+        size = self.shape[0]
+        if not (0 <= x < size and 0 <= y < size):
+            raise IndexError('Координаты выходят за поле')
+        return self._board.get(x, y)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def tolist(self) -> list:
+        return [list(row) for row in self._board.rows()]
+
+
+class BitBoard:
+    """Хранилище игрового поля в виде битовых масок.
+    Каждый слой (палубы, попадания, зона вокруг кораблей) - одно целое число,
+    клетка (x, y) соответствует биту с номером y * size + x.
+    Корабль ставится на поле одной операцией ИЛИ со сдвинутой маской, а проверка места
+    под новый корабль - одной операцией И с зоной вокруг кораблей, поэтому хранилище выгодно
+    при расстановке случайным подбором позиций на больших полях (GamePole._place_fleet_sparse)"""
+
+    _BIT_BYTES = tuple(bytes(b >> k & 1 for k in range(8)) for b in range(256))  # байт -> 8 клеток по 0 или 1
+
+    def __init__(self, size: int):
+        self._size = size
+        self._ship_masks = {}  # маски кораблей в начале координат по (длина, ориентация)
+        self._hit_masks = {}  # маски подбитых палуб вертикальных кораблей в начале координат по (длина, палубы)
+        self._rows_rep = [0]  # h -> по одному младшему биту в каждой из h строк
+        self._ships = 0  # занятые палубами клетки
+        self._hits = 0  # подбитые палубы
+        self._halo = None  # клетки кораблей и клетки вокруг них (None - будет построена при следующей проверке)
+        self._rows_cache = None  # результат rows() до следующего изменения поля
+
+    def clear(self):
+        """Метод для очистки поля"""
+        self._ships = self._hits = 0
+        self._halo = None  # зона нужна только для check_around и строится при первой проверке
+        self._rows_cache = None
+
+    def get(self, x: int, y: int) -> int:
+        """Метод для получения значения клетки с координатами x, y"""
+        bit = 1 << y * self._size + x
+        if self._hits & bit:
+            return 2
+        return 1 if self._ships & bit else 0
+
+    def set(self, x: int, y: int, value: int):
+        """Метод для записи значения в клетку с координатами x, y.
+        Зона вокруг кораблей сбрасывается, только если меняются занятые палубами клетки"""
+        bit = 1 << y * self._size + x
+        self._rows_cache = None
+        if value:
+            if not self._ships & bit:
+                self._ships |= bit
+                self._halo = None
+            if value == 2:
+                self._hits |= bit
+            elif self._hits & bit:
+                self._hits ^= bit
+        elif self._ships & bit:
+            self._ships ^= bit
+            self._halo = None
+            if self._hits & bit:
+                self._hits ^= bit
+
+    def _rows(self, h: int) -> int:
+        """Метод для получения маски с единичным младшим битом в каждой из h строк"""
+        rows_rep = self._rows_rep
+        while len(rows_rep) <= h:
+            rows_rep.append(rows_rep[-1] << self._size | 1)
+        return rows_rep[h]
+
+    def _ship_mask(self, length: int, orientation: int) -> int:
+        """Метод для получения маски клеток корабля с началом в клетке (0, 0)"""
+        key = length, orientation
+        mask = self._ship_masks.get(key)
+        if mask is None:
+            mask = self._ship_masks[key] = (1 << length) - 1 if orientation == Ship.HORIZONTAL else self._rows(length)
+        return mask
+
+    def _rect_mask(self, x0: int, y0: int, x1: int, y1: int) -> int:
+        """Метод для получения маски прямоугольника от (x0, y0) до (x1, y1) включительно"""
+        return ((1 << x1 - x0 + 1) - 1) * self._rows(y1 - y0 + 1) << y0 * self._size + x0
+
+    def _around_mask(self, length: int, x: int, y: int, orientation: int) -> int:
+        """Метод для получения маски клеток корабля и клеток вокруг него (прямоугольник, обрезанный по краям поля)"""
+        size = self._size
+        x1 = min(x + length if orientation == Ship.HORIZONTAL else x + 1, size - 1)
+        y1 = min(y + 1 if orientation == Ship.HORIZONTAL else y + length, size - 1)
+        return self._rect_mask(max(x - 1, 0), max(y - 1, 0), x1, y1)
+
+    def put_ship(self, ship: Ship):
+        """Метод для записи палуб корабля на поле"""
+        x, y = ship.get_start_coords()
+        length, tp = ship.length, ship.tp
+        shift = y * self._size + x
+        self._ships |= self._ship_mask(length, tp) << shift
+        self._rows_cache = None
+        hits = ship._hits  # бит k - палуба k
+        if hits:
+            if tp == Ship.VERTICAL:
+                key = length, hits
+                mask = self._hit_masks.get(key)
+                if mask is None:
+                    mask = self._hit_masks[key] = sum(1 << k * self._size for k in range(length) if hits >> k & 1)
+                hits = mask
+            self._hits |= hits << shift
+        if self._halo is not None:
+            self._halo |= self._around_mask(length, x, y, tp)
+
+    def _dilate(self, mask: int) -> int:
+        """Метод для расширения маски на одну клетку во все стороны (в том числе по диагонали)"""
+        size = self._size
+        full = (1 << size * size) - 1
+        first_col = self._rows(size)
+        mask |= (mask << 1) & ~first_col | (mask >> 1) & ~(first_col << size - 1)
+        mask |= (mask << size) | (mask >> size)
+        return mask & full
+
+    def check_around(self, length: int, head_coord: tuple, orientation: int) -> int:
+        """Метод для проверки наличия кораблей вокруг и на месте установки корабля.
+        Возвращает количество клеток корабля, попадающих в зону других кораблей"""
+        if self._halo is None:
+            self._halo = self._dilate(self._ships)
+        x, y = head_coord
+        return (self._ship_mask(length, orientation) << y * self._size + x & self._halo).bit_count()
+
+    def is_empty(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Метод для проверки отсутствия палуб в прямоугольнике от (x0, y0) до (x1, y1) включительно"""
+        return not self._rect_mask(x0, y0, x1, y1) & self._ships
+
+    def rows(self) -> tuple:
+        """Метод для получения поля в виде кортежа строк.
+        Битовые слои раскладываются в байты клеток по таблице, значения клеток - сумма слоев.
+        Пока поле не меняется, возвращается один и тот же (неизменяемый) результат"""
+        if self._rows_cache is not None:
+            return self._rows_cache
+        size = self._size
+        count = size * size
+        width = (count + 7) // 8
+        table = self._BIT_BYTES
+        cells = b''.join(map(table.__getitem__, self._ships.to_bytes(width, 'little')))
+        if self._hits:
+            hits = b''.join(map(table.__getitem__, self._hits.to_bytes(width, 'little')))
+            # в каждом байте 0 или 1, поэтому сложение чисел складывает клетки без переносов
+            cells = (int.from_bytes(cells, 'little') + int.from_bytes(hits, 'little')).to_bytes(len(cells), 'little')
+        self._rows_cache = tuple(tuple(cells[i:i + size]) for i in range(0, count, size))
+        return self._rows_cache
+
+    def view(self) -> BoardView:
+        """Метод для получения представления поля только для чтения без копирования: view[y, x]"""
+        return BoardView(self, self._size)
+
+
+class SparseBoard:
+    """Хранилище игрового поля в виде словаря, где хранятся только клетки с палубами.
+    Память и время работы зависят от числа палуб, а не от размера поля"""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._cells = {}  # (x, y) -> 1 или 2
+
+    def clear(self):
+        """Метод для очистки поля"""
+        self._cells.clear()
+
+    def get(self, x: int, y: int) -> int:
+        """Метод для получения значения клетки с координатами x, y"""
+        return self._cells.get((x, y), 0)
+
+    def set(self, x: int, y: int, value: int):
+        """Метод для записи значения в клетку с координатами x, y"""
+        if value:
+            self._cells[x, y] = value
+        else:
+            self._cells.pop((x, y), None)
+
+    def put_ship(self, ship: Ship):
+        """Метод для записи палуб корабля на поле"""
+        x, y = ship.get_start_coords()
+        horizontal = ship.tp == ship.HORIZONTAL
+        for k in range(ship.length):
+            self._cells[(x + k, y) if horizontal else (x, y + k)] = ship[k]
+
+    def check_around(self, length: int, head_coord: tuple, orientation: int) -> int:
+        """Метод для проверки наличия кораблей вокруг и на месте установки корабля"""
+        x, y = head_coord
+        x1, y1 = (x + length, y + 1) if orientation == Ship.HORIZONTAL else (x + 1, y + length)
+        cells = self._cells
+        return sum(cells.get((i, j), 0) for j in range(y - 1, y1 + 1) for i in range(x - 1, x1 + 1))
+
+    def is_empty(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Метод для проверки отсутствия палуб в прямоугольнике от (x0, y0) до (x1, y1) включительно"""
+        cells = self._cells
+        return not any((x, y) in cells for y in range(y0, y1 + 1) for x in range(x0, x1 + 1))
+
+    def rows(self) -> tuple:
+        """Метод для получения поля в виде кортежа строк (требует памяти на все поле)"""
+        rows = [[0] * self._size for _ in range(self._size)]
+        for (x, y), value in self._cells.items():
+            rows[y][x] = value
+        return tuple(tuple(row) for row in rows)
+
+    def view(self) -> BoardView:
+        """Метод для получения представления поля только для чтения без копирования: view[y, x]"""
+        return BoardView(self, self._size)
+
+
+class _AnchorPool:
+    """Множество допустимых позиций начала корабля заданной длины и ориентации.
+    Хранится битовой маской: позиция (x, y) соответствует биту с номером y * size + x"""
+
+    def __init__(self, size: int, length: int, tp: int):
+        self._size = size
+        if length > size:
+            self._mask = 0
+        elif tp == Ship.HORIZONTAL:
+            rows_rep = ((1 << size * size) - 1) // ((1 << size) - 1)  # по одному младшему биту в каждой строке
+            self._mask = ((1 << size - length + 1) - 1) * rows_rep
+        else:
+            self._mask = (1 << size * (size - length + 1)) - 1
+
+    def __bool__(self):
+        return self._mask != 0
+
+    def __len__(self):
+        return bin(self._mask).count('1')
+
+    def choice(self, rng) -> tuple:
+        """Метод для выбора случайной позиции с равной вероятностью"""
+        n = rng.randint(0, len(self) - 1)  # номер выбираемого бита среди установленных
+        mask, pos, width = self._mask, 0, self._mask.bit_length()
+        while width > 1:  # двоичный поиск n-го установленного бита
+            half = width >> 1
+            low = mask & ((1 << half) - 1)
+            count = bin(low).count('1')
+            if n < count:
+                mask, width = low, half
+            else:
+                n -= count
+                mask >>= half
+                pos += half
+                width -= half
+        return pos % self._size, pos // self._size
+
+    def discard(self, blocked: int):
+        """Метод для удаления позиций, отмеченных в маске blocked"""
+        self._mask &= ~blocked
 
 
 class GamePole:
     """Класс для описания игрового поля"""
 
-    def __init__(self, size: int = 10):
+    MAX_PLACEMENT_RESTARTS = 1000  # предельное число перезапусков расстановки кораблей
+    MAX_PLACEMENT_ATTEMPTS = 1000  # предельное число случайных попыток поставить корабль на большом поле
+    MAX_PLACEMENT_DRAWS_PER_SHIP = 100  # на большом поле: всего случайных попыток за init() на один корабль флота
+    DENSE_SIZE_LIMIT = 64  # поля большего размера по умолчанию хранятся в SparseBoard
+    FLEET = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)  # длины кораблей флота по умолчанию
+    _NEIGHBOURS = (1, 0), (0, 1), (1, 1), (1, -1)  # соседние клетки (вторая половина проверяется с другой стороны)
+
+    def __init__(self, size: int = 10, board: type = None, renderer: ConsoleRenderer = None, fleet: tuple = None,
+                 rng=None, stats: Stats = None):
+        if board is None:
+            board = GridBoard if size <= self.DENSE_SIZE_LIMIT else SparseBoard
         self._size = size  # размер игрового поля
+        self._fleet = tuple(fleet) if fleet is not None else self.FLEET  # длины кораблей
         self._ships = []  # список из кораблей на поле
-        self._field = [[0] * self._size for _ in range(self._size)]  # игровое поле
+        # игровое поле (GridBoard - массив байтов, BitBoard - битовые маски, SparseBoard - словарь)
+        self._board = board(size)
+        self._renderer = renderer if renderer is not None else ConsoleRenderer()  # вывод поля в консоль
+        self._rng = rng if rng is not None else _MODULE_RNG  # генератор случайных чисел (по умолчанию - модуля random)
+        self._stats = stats if stats is not None else NULL_STATS  # счетчики и таймеры (по умолчанию не собираются)
         self._name = ''
         self._count_dead_ships = 0
+        self._placement_restarts = 0  # количество перезапусков расстановки кораблей
+        self._placement_draws = 0  # оставшееся за init() число случайных попыток на большом поле
+        self._ships_parts = {}  # координаты палубы -> (корабль, номер палубы, номер корабля)
+        self._listeners = []  # подписчики на события поля
         self._generate_ships()  # создание кораблей
 
     def __bool__(self):
-        return self._count_dead_ships == 10
+        return self._count_dead_ships == len(self._ships)
+
+    @property
+    def size(self) -> int:
+        return self._size
 
     @property
     def ships(self):
         return self._ships
 
+    @property
+    def stats(self) -> Stats:
+        return self._stats
+
     @property
     def name(self):
         return self._name
@@ -174,73 +619,156 @@ class GamePole:
 
     def _check_ships_around(self, length: int, head_coord: tuple, orientation: int) -> int:
         """Метод для проверки наличия кораблей вокруг и на месте установки корабля"""
-        indexes = (-1, 0), (1, 0), (0, 1), (0, -1), (-1, -1), (1, -1), (-1, 1), (1, 1), (0, 0)
-        head_x, head_y = head_coord
-        result = 0
-
-        if orientation == 1:  # горизонтально
-            j = head_x
-            k = 0
-            while length > k:  # пока не проверили на наличие кораблей вокруг и на месте установки
-                result += sum(self._field[head_y + x][j + y] for x, y in indexes
-                              if 0 <= head_y + x < self._size and 0 <= j + y < self._size)
-                j += 1
-                k += 1
-
-        elif orientation == 2:  # вертикально
-            i = head_y
-            k = 0
-            while length > k:  # пока не проверили на наличие кораблей вокруг и на месте установки
-                result += sum(self._field[i + x][head_x + y] for x, y in indexes
-                              if 0 <= i + x < self._size and 0 <= head_x + y < self._size)
-                i += 1
-                k += 1
-
-        return result
+        return self._board.check_around(length, head_coord, orientation)
 
     def _generate_ships(self):
         """Метод для создания кораблей со случайной ориентацией и без начальных координат"""
-        self._ships = [Ship(4, tp=randint(1, 2)), Ship(3, tp=randint(1, 2)), Ship(3, tp=randint(1, 2)),
-                       Ship(2, tp=randint(1, 2)), Ship(2, tp=randint(1, 2)), Ship(2, tp=randint(1, 2)),
-                       Ship(1, tp=randint(1, 2)), Ship(1, tp=randint(1, 2)), Ship(1, tp=randint(1, 2)),
-                       Ship(1, tp=randint(1, 2))]
-
-    def init(self):
-        """Метод для начальной инициализации игрового поля"""
+        self._ships = [Ship(length, tp=self._rng.randint(1, 2)) for length in self._fleet]
+
+    def init(self, layout: tuple = None):
+        """Метод для начальной инициализации игрового поля.
+        Каждый корабль ставится в случайную из еще допустимых позиций;
+        если очередной корабль поставить некуда - расстановка начинается заново.
+        На больших полях позиции выбираются случайно с проверкой по полю,
+        всего не более MAX_PLACEMENT_DRAWS_PER_SHIP попыток на корабль флота за вызов (с перезапусками).
+        Если расставить корабли не удалось - ValueError.
+        Если передана готовая расстановка layout (см. get_layout) - корабли ставятся по ней"""
+        if layout is not None:
+            self._set_layout(layout)
+            if self._listeners:
+                self.emit(Event(Event.PLACED, self, None, None, None))
+            return
+
+        stats = self._stats
+        start = time.perf_counter() if stats.enabled else 0.0
+        place_fleet = self._place_fleet if self._size <= self.DENSE_SIZE_LIMIT else self._place_fleet_sparse
+        self._placement_restarts = 0
+        self._placement_draws = self.MAX_PLACEMENT_DRAWS_PER_SHIP * len(self._ships)
+        while not place_fleet():
+            self._placement_restarts += 1
+            if self._placement_restarts > self.MAX_PLACEMENT_RESTARTS or self._placement_draws <= 0:
+                raise ValueError('Не удалось расставить корабли на поле такого размера')
+
+        if stats.enabled:
+            stats.count('init.calls')
+            stats.count('init.restarts', self._placement_restarts)
+            stats.observe('init', time.perf_counter() - start)
+        if self._listeners:
+            self.emit(Event(Event.PLACED, self, None, None, None))
+
+    def get_layout(self) -> tuple:
+        """Метод для получения расстановки кораблей в виде кортежа (x, y, ориентация) для каждого корабля"""
+        return tuple((ship.x, ship.y, ship.tp) for ship in self._ships)
+
+    def _set_layout(self, layout: tuple):
+        """Метод для расстановки кораблей по готовой расстановке с проверкой ее правильности"""
+        if len(layout) != len(self._ships):
+            raise ValueError('Количество кораблей в расстановке не совпадает с флотом')
+        self._board.clear()
+        parts = self._ships_parts
+        parts.clear()
+
+        for index, (ship, (x, y, tp)) in enumerate(zip(self._ships, layout)):
+            if tp not in (Ship.HORIZONTAL, Ship.VERTICAL):
+                raise ValueError('Значение ориентации должно быть 1 или 2')
+            ship._tp = tp
+            ship.set_start_coords(x, y)
+            if ship.is_out_pole(self._size):
+                raise ValueError('Корабли расстановки выходят за поле или касаются друг друга')
+            count = len(parts)
+            self._add_ship_parts(ship, index)
+            if len(parts) != count + ship.length:  # палуба попала в клетку другого корабля
+                raise ValueError('Корабли расстановки выходят за поле или касаются друг друга')
+
+        # проверка касания по индексу палуб: у соседних клеток палубы должны быть только свои
+        for (x, y), (ship, _, _) in parts.items():
+            for dx, dy in self._NEIGHBOURS:
+                other = parts.get((x + dx, y + dy))
+                if other is not None and other[0] is not ship:
+                    raise ValueError('Корабли расстановки выходят за поле или касаются друг друга')
         for ship in self._ships:
-            tp, length = ship.tp, ship.length
-            while True:  # пока корабли не расставлены
-                x, y = randint(0, self._size - 1), randint(0, self._size - 1)  # ship_x -> j; ship_y -> i
-                if tp == ship.HORIZONTAL:  # если расположение корабля горизонтальное
-                    if x + (length - 1) > self._size - 1:  # если длина корабля выходит за поле
-                        continue
-
-                    result = self._check_ships_around(length, (x, y), tp)
-
-                    if not result:  # если кораблей нет рядом и нет на месте
-                        k = 0
-                        for j in range(x, x + length):
-                            self._field[y][j] = ship[k]  # установка корабля на поле с k-палубами
-                            k += 1
-                    else:
-                        continue
-
-                elif tp == ship.VERTICAL:  # если расположение корабля вертикальное
-                    if y + (length - 1) > self._size - 1:  # если длина корабля выходит за поле
-                        continue
-
-                    result = self._check_ships_around(length, (x, y), tp)
-
-                    if not result:  # если кораблей нет рядом и нет на месте
-                        k = 0
-                        for i in range(y, y + length):
-                            self._field[i][x] = ship[k]
-                            k += 1
-                    else:
-                        continue
-
-                ship.set_start_coords(x, y)  # установить в текущем корабле его начальные координаты
-                break
+            self._board.put_ship(ship)  # установка корабля на поле с k-палубами
+
+    def _place_fleet(self) -> bool:
+        """Метод для одной попытки расстановки всех кораблей.
+        Возвращает False, если какой-то из кораблей поставить не удалось"""
+        self._board.clear()
+        self._ships_parts.clear()
+        lengths = {ship.length for ship in self._ships}
+        max_length = max(lengths, default=0)
+        row = (1 << self._size) - 1
+        rows_rep = [((1 << self._size * h) - 1) // row for h in range(max_length + 3)]  # единичные биты в начале h строк
+        anchors = {(length, tp): _AnchorPool(self._size, length, tp)
+                   for length in lengths for tp in (Ship.HORIZONTAL, Ship.VERTICAL)}
+
+        for index, ship in enumerate(self._ships):
+            length = ship.length
+            tp = ship.tp if anchors[length, ship.tp] else 3 - ship.tp  # если в своей ориентации места нет - пробуем другую
+            pool = anchors[length, tp]
+            if not pool:
+                return False
+
+            x, y = pool.choice(self._rng)
+            if tp != ship.tp:
+                ship._tp = tp
+            ship._place(x, y)  # установить в текущем корабле его начальные координаты
+            self._board.put_ship(ship)  # установка корабля на поле с k-палубами
+            self._add_ship_parts(ship, index)
+
+            # исключение позиций, при которых корабль пересекается с поставленным или касается его
+            x0, y0 = max(x - 1, 0), max(y - 1, 0)
+            x1 = min(x + length if tp == ship.HORIZONTAL else x + 1, self._size - 1)
+            y1 = min(y + 1 if tp == ship.HORIZONTAL else y + length, self._size - 1)
+            rect = (((1 << x1 - x0 + 1) - 1) << x0) * rows_rep[y1 - y0 + 1] << y0 * self._size
+            for pool_tp, step in (Ship.HORIZONTAL, 1), (Ship.VERTICAL, self._size):
+                blocked = rect
+                for pool_length in range(1, max_length + 1):
+                    blocked |= rect >> step * (pool_length - 1)
+                    pool = anchors.get((pool_length, pool_tp))
+                    if pool is not None:
+                        pool.discard(blocked)
+
+        return True
+
+    def _place_fleet_sparse(self) -> bool:
+        """Метод для одной попытки расстановки всех кораблей на большом поле.
+        Позиция корабля выбирается случайно, пока не найдется свободная (не более MAX_PLACEMENT_ATTEMPTS раз
+        и пока не исчерпан общий для всех перезапусков запас попыток init()).
+        Возвращает False, если какой-то из кораблей поставить не удалось"""
+        self._board.clear()
+        self._ships_parts.clear()
+
+        for index, ship in enumerate(self._ships):
+            length, tp = ship.length, ship.tp
+            if length > self._size:
+                return False
+            max_x = self._size - length if tp == ship.HORIZONTAL else self._size - 1
+            max_y = self._size - 1 if tp == ship.HORIZONTAL else self._size - length
+            placed = False
+            attempts = min(self.MAX_PLACEMENT_ATTEMPTS, self._placement_draws)
+            for attempt in range(1, attempts + 1):
+                x, y = self._rng.randint(0, max_x), self._rng.randint(0, max_y)
+                if not self._check_ships_around(length, (x, y), tp):
+                    placed = True
+                    break
+            else:
+                attempt = attempts
+            self._placement_draws -= attempt
+            if self._stats.enabled:
+                self._stats.count('init.sparse_attempts', attempt)
+            if not placed:
+                return False
+
+            ship._place(x, y)  # установить в текущем корабле его начальные координаты
+            self._board.put_ship(ship)  # установка корабля на поле с k-палубами
+            self._add_ship_parts(ship, index)
+
+        return True
+
+    @property
+    def placement_restarts(self) -> int:
+        """Количество перезапусков расстановки при последнем вызове init()"""
+        return self._placement_restarts
 
     def get_ships(self) -> list:
         """Метод для возврата списка кораблей на поле"""
@@ -249,112 +777,475 @@ class GamePole:
     def update_game_field(self):
         """Метод для обновления игрового поля
         после движения кораблей и после каждого хода"""
-        for i in range(self._size):  # обнуление поля
-            for j in range(self._size):
-                self._field[i][j] = 0
-
-        for ship in self._ships:
-            x, y, length = ship.x, ship.y, ship.length
-            ship_part = 0
-
-            if ship.tp == ship.HORIZONTAL:
-                for j in range(x, x + length):
-                    self._field[y][j] = ship[ship_part]  # установка корабля на поле с k-палубами
-                    ship_part += 1
-            elif ship.tp == ship.VERTICAL:
-                for i in range(y, y + length):
-                    self._field[i][x] = ship[ship_part]
-                    ship_part += 1
-
-    def move_ships(self):
-        """Метод для перемещения каждого корабля на одну клетку"""
-        for ship in self._ships:
-            old_x, old_y = ship.get_start_coords()
-            directions = ['forward', 'back']  # допустимые направления движения
-            is_conflict = False
-            while directions or not is_conflict:
-                shuffle(directions)  # перемешивание списка с направлениями
-                direction = directions.pop()  # и взятие первого
-
-                x = y = 0  # переменные для новых (возможных) координат
-                if direction == 'forward' and ship.tp == ship.HORIZONTAL and ship.is_move:
-                    x = ship.x + 1
-                    y = ship.y
-                elif direction == 'back' and ship.tp == ship.HORIZONTAL and ship.is_move:
-                    x = ship.x - 1
-                    y = ship.y
-                elif direction == 'forward' and ship.tp == ship.VERTICAL and ship.is_move:
-                    x = ship.x
-                    y = ship.y + 1
-                elif direction == 'back' and ship.tp == ship.VERTICAL and ship.is_move:
-                    x = ship.x
-                    y = ship.y - 1
-                else:
+        if self._stats.enabled:
+            self._stats.count('update_game_field')
+        self._board.clear()  # обнуление поля
+        self._ships_parts.clear()
+
+        for index, ship in enumerate(self._ships):
+            self._board.put_ship(ship)  # установка корабля на поле с k-палубами
+            self._add_ship_parts(ship, index)
+
+    def _add_ship_parts(self, ship: Ship, index: int):
+        """Метод для добавления координат палуб корабля с номером index в индекс"""
+        x, y = ship.get_start_coords()
+        horizontal = ship.tp == ship.HORIZONTAL
+        for k in range(ship.length):
+            self._ships_parts[(x + k, y) if horizontal else (x, y + k)] = ship, k, index
+
+    def update_cell(self, coord: tuple):
+        """Метод для обновления клетки поля по состоянию находящейся в ней палубы"""
+        part = self._ships_parts.get(coord)
+        self._board.set(*coord, part[0][part[1]] if part else 0)
+
+    def get_ship_part(self, coord: tuple) -> Union[tuple, None]:
+        """Метод для получения корабля, номера его палубы и номера корабля на поле по координатам клетки
+        (None - если в клетке нет корабля)"""
+        return self._ships_parts.get(coord)
+
+    def move_ships(self) -> list:
+        """Метод для перемещения каждого корабля на одну клетку.
+        На поле меняются только клетки, которые корабль покинул и занял.
+        Возвращает список перемещений (номер корабля, направление)"""
+        stats = self._stats
+        start = time.perf_counter() if stats.enabled else 0.0
+        moves = []
+        for index, ship in enumerate(self._ships):
+            if not ship.is_move:
+                continue
+            directions = [1, -1]  # вперед и назад
+            self._rng.shuffle(directions)  # перемешивание списка с направлениями
+            for attempt, go in enumerate(directions):
+                if self._move_ship(ship, go):
+                    moves.append((index, go))
                     break
+            else:
+                if stats.enabled:
+                    stats.count('move.blocked')  # корабль не смог сдвинуться ни в одну сторону
+            if stats.enabled and attempt:
+                stats.count('move.direction_retries')
+
+        if stats.enabled:
+            stats.count('move.moved', len(moves))
+            stats.observe('move_ships', time.perf_counter() - start)
+        if self._listeners:
+            for index, go in moves:
+                self.emit(Event(Event.MOVED, self, self._ships[index].get_start_coords(), index, go))
+        return moves
+
+    def _move_ship(self, ship: Ship, go: int) -> bool:
+        """Метод для перемещения корабля на одну клетку вперед (go=1) или назад (go=-1).
+        Так как до перемещения корабль ни с кем не соприкасается, достаточно проверить
+        клетки, которые добавляются к зоне вокруг корабля с той стороны, куда он движется.
+        Возвращает False, если перемещение невозможно"""
+        x, y = ship.get_start_coords()
+        length = ship.length
+        horizontal = ship.tp == ship.HORIZONTAL
+        along = x if horizontal else y  # координата вдоль оси корабля
+        enter = along + length if go == 1 else along - 1  # клетка, которую корабль займет
+        leave = along if go == 1 else along + length - 1  # клетка, которую корабль покинет
+        front = enter + go  # ряд клеток перед кораблем после перемещения
+        if not 0 <= enter < self._size:  # если корабль выходит за поле
+            return False
+
+        across = y if horizontal else x  # координата поперек оси корабля
+        if 0 <= front < self._size:
+            if self._stats.enabled:
+                self._stats.count('move.collision_checks')
+            side0, side1 = max(across - 1, 0), min(across + 1, self._size - 1)
+            rect = (front, side0, front, side1) if horizontal else (side0, front, side1, front)
+            if not self._board.is_empty(*rect):  # столкновение или касание
+                return False
+
+        index = self._ships_parts[x, y][2]
+        for k in range(length):
+            del self._ships_parts[(x + k, y) if horizontal else (x, y + k)]
+        ship._place(*((x + go, y) if horizontal else (x, y + go)))
+        self._board.set(*((leave, across) if horizontal else (across, leave)), 0)
+        self._board.set(*((enter, across) if horizontal else (across, enter)), ship[0 if go == -1 else length - 1])
+        self._add_ship_parts(ship, index)
+        return True
 
-                try:
-                    ship.set_start_coords(x, y)  # пробуем применить новые координаты начала для корабля
-                except TypeError:  # если координаты меньше 0, то ловим исключение и пробуем другое направление
-                    continue
+    def show(self):
+        """Метод для отображения игрового поля в консоли"""
+        if self._renderer.enabled:
+            self._renderer.show_board(self._board.rows(), self.name)
 
-                if ship.is_out_pole(self._size):  # если корабль выходит за поле - попробовать другое направление
-                    ship.set_start_coords(old_x, old_y)
-                    continue
+    def get_pole(self) -> tuple:
+        """Метод для получения текущего игрового поля (копия всего поля)"""
+        return self._board.rows()
 
-                for curr_ship in self._ships:
-                    if curr_ship != ship:
-                        if not ship.is_collide(curr_ship):  # проверка столкновения текущего корабля с другими
-                            continue
-                        else:  # если было столкновение или пересечение
-                            ship.set_start_coords(old_x, old_y)  # сброс новых координат до начальных
-                            is_conflict = True  # и установка флага конфликта
-                            break
-                if is_conflict:  # если был обнаружен конфликт - попробовать переместить корабль в другую сторону
-                    continue
-                break
+    def view(self):
+        """Метод для получения представления поля только для чтения без копирования:
+        view[y, x] - текущее значение клетки. Представление не меняется при изменении поля - его можно
+        получить один раз и читать вместе с событиями подписки"""
+        return self._board.view()
 
-        self.update_game_field()  # обновить поле с новым размещением кораблей
+    @property
+    def has_listeners(self) -> bool:
+        """Есть ли подписчики на события поля (если нет - события можно не создавать)"""
+        return bool(self._listeners)
 
-    def show(self):
-        """Метод для отображения игрового поля в консоли"""
-        print(f'{self.name:^{self._size * 2}}')
-        print(' '.join(chr(i) for i in range(97, 97 + self._size)))
-        print('-' * (self._size * 2 - 1))
+    def subscribe(self, listener):
+        """Метод для подписки на события поля: listener(event) вызывается с объектом Event
+        при выстреле по полю, перемещении корабля и расстановке кораблей"""
+        self._listeners.append(listener)
 
-        for i, row in enumerate(self._field, 1):
-            print(f'{" ".join(str(s) for s in row)}  {i}')
-        print('_' * (self._size * 2 - 1))
-        print()
+    def unsubscribe(self, listener):
+        """Метод для отмены подписки listener"""
+        self._listeners.remove(listener)
 
-    def get_pole(self) -> tuple:
-        """Метод для получения текущего игрового поля"""
-        return tuple(tuple(row) for row in self._field)
+    def emit(self, event: Event):
+        """Метод для передачи события всем подписчикам поля"""
+        for listener in tuple(self._listeners):
+            listener(event)
 
     def __repr__(self) -> str:
         return f'Размер поля - {self._size} x {self._size}'
 
 
+class Shooter:
+    """Базовый класс стратегии выбора клеток для выстрела в партии без ввода-вывода"""
+
+    def __init__(self, size: int, fleet: tuple = GamePole.FLEET, rng=None):
+        self._size = size  # размер поля соперника
+        self._fleet = fleet  # длины кораблей соперника
+        self._rng = rng if rng is not None else _MODULE_RNG  # генератор случайных чисел
+
+    def choose(self) -> Union[tuple, None]:
+        """Метод для выбора координат следующего выстрела (None - стрелять больше некуда)"""
+        raise NotImplementedError
+
+    def report(self, coord: tuple, result: int, ship: Union[Ship, None]):
+        """Метод для получения результата выстрела в клетку coord"""
+
+
+class RandomShooter(Shooter):
+    """Стратегия стрельбы в случайные, еще не обстрелянные клетки.
+    Пока обстреляно меньше половины поля - клетка выбирается случайно с проверкой по множеству выстрелов,
+    затем - из перемешанного списка оставшихся клеток"""
+
+    def __init__(self, size: int, fleet: tuple = GamePole.FLEET, rng=None):
+        super().__init__(size, fleet, rng)
+        self._shots = set()  # обстрелянные клетки
+        self._cells = None  # перемешанный список необстрелянных клеток
+
+    def choose(self) -> Union[tuple, None]:
+        size = self._size
+        if self._cells is None:
+            if len(self._shots) * 2 < size * size:
+                while True:
+                    coord = self._rng.randint(0, size - 1), self._rng.randint(0, size - 1)
+                    if coord not in self._shots:
+                        self._shots.add(coord)
+                        return coord
+            self._cells = [(x, y) for y in range(size) for x in range(size) if (x, y) not in self._shots]
+            self._rng.shuffle(self._cells)
+        cells, shots = self._cells, self._shots
+        while cells:
+            coord = cells.pop()
+            if coord not in shots:  # клетка могла быть исключена после составления списка
+                shots.add(coord)
+                return coord
+        return None
+
+
+class HuntShooter(RandomShooter):
+    """Стратегия "поиск и добивание" для больших полей: корабли ищутся случайными выстрелами,
+    после попадания обстреливаются соседние клетки вдоль подбитого корабля.
+    Клетки по диагонали от попаданий и вокруг уничтоженных кораблей считаются обстрелянными.
+    Память и время хода зависят от числа выстрелов, а не от площади поля"""
+
+    def __init__(self, size: int, fleet: tuple = GamePole.FLEET, rng=None):
+        super().__init__(size, fleet, rng)
+        self._hits = []  # подбитые палубы еще не уничтоженного корабля
+
+    def choose(self) -> Union[tuple, None]:
+        if self._hits:
+            coord = self._choose_target()
+            if coord is not None:
+                self._shots.add(coord)
+                return coord
+        return super().choose()
+
+    def _choose_target(self) -> Union[tuple, None]:
+        """Метод для выбора клетки рядом с подбитыми палубами:
+        после одного попадания - любая соседняя по стороне, после нескольких - продолжение линии"""
+        hits, size = self._hits, self._size
+        (x0, y0), (x1, y1) = min(hits), max(hits)
+        if len(hits) == 1:
+            candidates = (x0 - 1, y0), (x0 + 1, y0), (x0, y0 - 1), (x0, y0 + 1)
+        elif y0 == y1:
+            candidates = (x0 - 1, y0), (x1 + 1, y0)
+        else:
+            candidates = (x0, y0 - 1), (x0, y1 + 1)
+        for x, y in candidates:
+            if 0 <= x < size and 0 <= y < size and (x, y) not in self._shots:
+                return x, y
+        return None
+
+    def _exclude(self, x: int, y: int, diagonal_only: bool = False):
+        """Метод для исключения соседних с (x, y) клеток, в которых не может быть кораблей"""
+        size, shots = self._size, self._shots
+        for dx, dy in (-1, -1), (1, -1), (-1, 1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1):
+            if (dx and dy or not diagonal_only) and 0 <= x + dx < size and 0 <= y + dy < size:
+                shots.add((x + dx, y + dy))
+
+    def report(self, coord: tuple, result: int, ship: Union[Ship, None]):
+        if result == SeaBattle.MISS:
+            return
+        self._exclude(*coord, diagonal_only=True)
+        if result == SeaBattle.HIT:
+            self._hits.append(coord)
+            return
+        self._hits.clear()
+        dx, dy = (1, 0) if ship.tp == ship.HORIZONTAL else (0, 1)
+        for i in range(ship.length):
+            self._exclude(ship.x + i * dx, ship.y + i * dy)
+
+
+class DensityShooter(Shooter):
+    """Стратегия стрельбы по карте плотности вероятности.
+    Для каждой клетки хранится число возможных расстановок оставшихся кораблей, проходящих через нее.
+    Карта обновляется только в окрестности клеток, про которые стало известно, что там нет корабля,
+    а клетка с наибольшей плотностью берется из кучи, в которую попадают только изменившиеся клетки.
+    Пока есть подбитый, но не уничтоженный корабль - стрельба ведется только по его возможным расстановкам"""
+
+    UNKNOWN, WATER, HIT, SUNK = range(4)  # состояния клеток поля соперника
+
+    def __init__(self, size: int, fleet: tuple = GamePole.FLEET, rng=None):
+        super().__init__(size, fleet, rng)
+        self._state = [self.UNKNOWN] * (size * size)  # состояния клеток (индекс клетки - y * size + x)
+        self._hits = set()  # индексы подбитых палуб еще не уничтоженного корабля
+        self._shots = set()  # индексы обстрелянных клеток
+        self._fleet = Counter(fleet)  # длина корабля -> количество еще не уничтоженных кораблей
+        self._length_density = {length: self._initial_density(length) for length in self._fleet}
+        self._density = [0] * (size * size)  # суммарная плотность по всем оставшимся кораблям
+        for length, count in self._fleet.items():
+            for i, value in enumerate(self._length_density[length]):
+                self._density[i] += count * value
+        # куча (-плотность, индекс); устаревшие записи пропускаются при выборе клетки
+        self._heap = [(-value, i) for i, value in enumerate(self._density)]
+        heapq.heapify(self._heap)
+        self._changed = set()  # клетки, плотность которых изменилась после последнего выбора
+
+    def _placements(self, length: int, index: int):
+        """Генератор расстановок корабля длины length, проходящих через клетку index.
+        Каждая расстановка - range индексов ее клеток"""
+        size = self._size
+        x, y = index % size, index // size
+        for start_x in range(max(0, x - length + 1), min(x, size - length) + 1):
+            first = y * size + start_x
+            yield range(first, first + length)
+        if length > 1:
+            for start_y in range(max(0, y - length + 1), min(y, size - length) + 1):
+                first = start_y * size + x
+                yield range(first, first + length * size, size)
+
+    def _initial_density(self, length: int) -> list:
+        """Метод для подсчета плотности корабля длины length на пустом поле.
+        Число расстановок вдоль строки зависит только от x, вдоль столбца - только от y"""
+        size = self._size
+        line = [max(0, min(x, size - length) - max(0, x - length + 1) + 1) for x in range(size)]
+        if length == 1:
+            return line * size
+        return [line[x] + line[y] for y in range(size) for x in range(size)]
+
+    def _block(self, index: int):
+        """Метод для отметки клетки, в которой точно нет целой палубы корабля,
+        с удалением из карты плотности всех проходивших через нее расстановок"""
+        state, density = self._state, self._density
+        if state[index] in (self.WATER, self.SUNK):
+            return
+        changed = self._changed
+        for length, count in self._fleet.items():
+            if not count:
+                continue
+            length_density = self._length_density[length]
+            for cells in self._placements(length, index):
+                if any(state[i] in (self.WATER, self.SUNK) for i in cells):  # расстановка уже была невозможна
+                    continue
+                for i in cells:
+                    length_density[i] -= 1
+                    density[i] -= count
+                changed.update(cells)
+        state[index] = self.WATER if state[index] == self.UNKNOWN else self.SUNK
+
+    def _neighbours(self, index: int, diagonal_only: bool = False):
+        """Генератор индексов соседних клеток"""
+        size = self._size
+        x, y = index % size, index // size
+        for dx, dy in (-1, -1), (1, -1), (-1, 1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1):
+            if dx and dy or not diagonal_only:
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    yield (y + dy) * size + x + dx
+
+    def choose(self) -> Union[tuple, None]:
+        state, size = self._state, self._size
+        index = self._choose_target() if self._hits else self._choose_hunt()
+        if index is None:  # расстановок не осталось (например, корабли перемещались) - любая необстрелянная клетка
+            unknown = ([i for i, value in enumerate(state) if value == self.UNKNOWN] or
+                       [i for i in range(size * size) if i not in self._shots])
+            if not unknown:
+                return None
+            index = unknown[self._rng.randint(0, len(unknown) - 1)]
+        return index % size, index // size
+
+    def _choose_hunt(self) -> Union[int, None]:
+        """Метод для выбора необстрелянной клетки с наибольшей плотностью (из равных - с меньшим индексом)"""
+        heap, state, density = self._heap, self._state, self._density
+        for i in self._changed:
+            if state[i] == self.UNKNOWN:
+                heapq.heappush(heap, (-density[i], i))
+        self._changed.clear()
+        while heap:
+            value, index = heap[0]
+            if state[index] == self.UNKNOWN and -value == density[index]:
+                return index if value else None
+            heapq.heappop(heap)  # клетка обстреляна или ее плотность с тех пор уменьшилась
+        return None
+
+    def _choose_target(self) -> Union[int, None]:
+        """Метод для выбора клетки подбитого корабля.
+        Учитываются только расстановки, проходящие через все его подбитые палубы"""
+        state, hits = self._state, self._hits
+        scores = Counter()
+        first = min(hits)
+        for length, count in self._fleet.items():
+            if not count or length < len(hits):
+                continue
+            for cells in self._placements(length, first):
+                if any(state[i] in (self.WATER, self.SUNK) for i in cells) or not hits.issubset(cells):
+                    continue
+                for i in cells:
+                    if state[i] == self.UNKNOWN:
+                        scores[i] += count
+        return max(scores, key=scores.__getitem__) if scores else None
+
+    def report(self, coord: tuple, result: int, ship: Union[Ship, None]):
+        x, y = coord
+        index = y * self._size + x
+        self._shots.add(index)
+        if result == SeaBattle.MISS:
+            self._block(index)
+            return
+
+        self._state[index] = self.HIT
+        self._hits.add(index)
+        for i in self._neighbours(index, diagonal_only=True):  # по диагонали от палубы кораблей быть не может
+            self._block(i)
+
+        if result == SeaBattle.SUNK:
+            length = ship.length
+            density, changed = self._density, self._changed
+            for i, value in enumerate(self._length_density[length]):  # корабль больше не учитывается в плотности
+                if value:
+                    density[i] -= value
+                    changed.add(i)
+            self._fleet[length] -= 1
+            step = 1 if ship.tp == ship.HORIZONTAL else self._size
+            first = ship.y * self._size + ship.x
+            cells = range(first, first + step * length, step)
+            for i in cells:
+                self._hits.discard(i)
+                self._block(i)
+            for i in cells:
+                for j in self._neighbours(i):
+                    self._block(j)
+
+
 class SeaBattle:
     """Класс для настройки и работы игрового процесса"""
-    _x_coord_translate = {'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6, 'g': 7, 'h': 8, 'i': 9, 'j': 10}
-    _comp_ships_coord = {}  # координаты всех палуб кораблей компьютера
-    _human_ships_coord = {}  # координаты всех палуб кораблей человека
-
-    def __init__(self, size_field, name_1: str = 'Computer', name_2: str = 'Human'):
+    MISS = 0  # результаты выстрела: промах,
+    HIT = 1  # попадание
+    SUNK = 2  # и уничтожение корабля
+    DRAW = 'draw'  # исход хода turn() вместо поля победителя: ничья, стрелять больше некуда
+    DENSITY_SIZE_LIMIT = 64  # на полях большего размера компьютер ищет корабли случайно и добивает подбитые
+    _coord_pattern = re.compile(r'([a-z]+)(\d+)')  # координаты в формате 'a1', 'ab12'
+
+    def __init__(self, size_field, name_1: str = 'Computer', name_2: str = 'Human', board: type = None,
+                 renderer: ConsoleRenderer = None, fleet: tuple = None, seed: int = None, rng=None,
+                 stats: Stats = None):
         self._size_field = size_field
-        self.computer, self.human = GamePole(size_field), GamePole(size_field)
+        self._renderer = renderer if renderer is not None else ConsoleRenderer()  # вывод полей в консоль
+        # генератор случайных чисел партии: переданный, созданный по seed или генератор модуля random
+        self.seed = seed
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else _MODULE_RNG
+        self._rng = rng
+        self._stats = stats if stats is not None else NULL_STATS  # счетчики и таймеры, общие с полями игроков
+        self.computer = GamePole(size_field, board, self._renderer, fleet, rng, self._stats)
+        self.human = GamePole(size_field, board, self._renderer, fleet, rng, self._stats)
         self.computer.name, self.human.name = name_1, name_2  # имена игроков
-        self._hit_points_comp = []  # координаты, в которые уже был выстрел
-        self._hit_points_human = []
-        self.result_field = [['-'] * self._size_field for _ in range(self._size_field)]
+        self._hit_points_comp = set()  # координаты, в которые уже был выстрел
+        self._hit_points_human = set()
+        fleet = tuple(fleet) if fleet is not None else GamePole.FLEET
+        shooter = DensityShooter if size_field <= self.DENSITY_SIZE_LIMIT else HuntShooter
+        self._comp_shooter = shooter(size_field, fleet, rng)  # стратегия стрельбы компьютера
+        self._shot_marks = {}  # результаты выстрелов человека: (x, y) -> 'X' или '*'
+        self._listeners = []  # подписчики на события партии
+
+    @property
+    def rng(self):
+        """Генератор случайных чисел партии (для стратегий стрельбы, которым нужен тот же поток)"""
+        return self._rng
+
+    @property
+    def stats(self) -> Stats:
+        """Счетчики и таймеры партии (снимок - stats.snapshot())"""
+        return self._stats
+
+    @property
+    def result_field(self) -> list:
+        """Поле с результатами выстрелов человека ('-' - выстрела не было)"""
+        field = [['-'] * self._size_field for _ in range(self._size_field)]
+        for (x, y), state in self._shot_marks.items():
+            field[y][x] = state
+        return field
 
-    def init(self):
+    @staticmethod
+    def column_index(label: str) -> int:
+        """Метод для перевода буквенного обозначения столбца ('a', 'z', 'aa', ...) в индекс с нуля"""
+        index = 0
+        for letter in label:
+            index = index * 26 + ord(letter) - 96
+        return index - 1
+
+    @staticmethod
+    def format_coord(coord: tuple) -> str:
+        """Метод для перевода индексов (x, y) в формат 'a1'"""
+        x, y = coord
+        return f'{column_label(x)}{y + 1}'
+
+    def parse_coord(self, coord: str) -> Union[tuple, None]:
+        """Метод для перевода координат в формате 'a1' в индексы (x, y).
+        Возвращает None, если координаты записаны неверно или выходят за поле"""
+        match = self._coord_pattern.fullmatch(coord.strip().lower())
+        if match is None:
+            return None
+        x, y = self.column_index(match.group(1)), int(match.group(2)) - 1
+        if 0 <= x < self._size_field and 0 <= y < self._size_field:
+            return x, y
+        return None
+
+    def init(self, pool=None):
         """Метод инициализации полей компьютера и человека.
-        Метод производит расстановку кораблей на полях соперников"""
-        self.computer.init()
-        self.human.init()
-        self._comp_ships_coord = self.get_all_ships_parts_coord(self.computer)
-        self._human_ships_coord = self.get_all_ships_parts_coord(self.human)
+        Метод производит расстановку кораблей на полях соперников.
+        Если передан запас расстановок pool (layoutpool.LayoutPool) - готовые расстановки берутся из него"""
+        if pool is None:
+            self.computer.init()
+            self.human.init()
+            return
+
+        if pool.size != self._size_field or pool.fleet != tuple(ship.length for ship in self.computer.ships):
+            raise ValueError('Запас расстановок подготовлен для другого поля или флота')
+        self.computer.init(pool.take())
+        self.human.init(pool.take())
+
+    def fork(self) -> 'GameState':
+        """Метод для получения независимого состояния партии (GameState) для перебора вариантов.
+        Расположение кораблей в состоянии не меняется, поэтому оно общее у всех копий"""
+        return GameState.from_game(self)
 
     @staticmethod
     def get_all_ships_parts_coord(field: GamePole) -> dict:
@@ -372,44 +1263,150 @@ class SeaBattle:
 
     def recognize_shell_place(self, shell_coord: tuple, gamer: GamePole) -> Union[Ship, None]:
         """Метод для распознавания места попадания снаряда"""
-        ships = self._comp_ships_coord if gamer is self.human else self._human_ships_coord
-        place = list(filter(lambda x: shell_coord in ships[x], ships))
-        return place[0] if place else None  # если есть попадание в корабль - вернуть корабль
+        opponent = self.computer if gamer is self.human else self.human
+        part = opponent.get_ship_part(shell_coord)
+        return part[0] if part else None  # если есть попадание в корабль - вернуть корабль
 
     def human_go(self):
         """Метод для реализации хода человека"""
-        x = y = None
         while True:
-            try:
-                coord = input('Введите координаты поля для выстрела в формате \'a1\': ')
-                x, y = coord[0], str(coord[1:])
-            except (TypeError, IndexError, ValueError):
+            coord = self.parse_coord(input('Введите координаты поля для выстрела в формате \'a1\': '))
+            if coord is None:
                 print('Введен не верный тип и/или диапазон координат')
                 continue
-            else:
-                if coord[0].lower() in [chr(let) for let in range(97, 97 + self._size_field)] and \
-                        coord[1] in [str(d) for d in range(1, self._size_field + 1)]:
-                    x, y = self._x_coord_translate.get(x) - 1, int(y) - 1
-                    if (x, y) in self._hit_points_human:
-                        print('Координаты уже использовались')
-                        continue
-                    break
+            if coord in self._hit_points_human:
+                print('Координаты уже использовались')
                 continue
+            break
 
-        shell_place = self.recognize_shell_place((x, y), self.human)  # определение места попадания снаряда
-        self._hit_points_human.append((x, y))  # и сохранение координат места в список
-
-        if shell_place is not None:  # если есть попадание в корабль
-            self._marked_broken_ship_part(self.human, shell_place, (x, y))
-            self.computer.update_game_field()  # обновление поля и его отображение
-            self.show_shot_location(x, y, 'X')  # отобразить на другом поле попадание по кораблю на x, y координате
-        else:
-            self.show_shot_location(x, y, '*')  # отобразить на другом поле промах на x, y координате
+        x, y = coord
+        start = time.perf_counter() if self._stats.enabled else 0.0  # время ввода координат не учитывается
+
+        result, ship = self.shoot(self.human, (x, y))  # выстрел и определение места попадания снаряда
+        # отметить на поле результатов попадание по кораблю или промах на x, y координате
+        self._shot_marks[x, y] = '*' if result == self.MISS else 'X'
+        self.show_boards()
+        if self._stats.enabled:
+            self._stats.observe('turn.human', time.perf_counter() - start)
+
+    def shoot(self, gamer: GamePole, coord: tuple) -> tuple:
+        """Метод для выстрела игрока gamer по полю соперника без ввода-вывода.
+        Возвращает результат выстрела (MISS, HIT или SUNK) и корабль, в который попал снаряд"""
+        size = self._size_field
+        try:
+            x, y = coord
+            inside = 0 <= x < size and 0 <= y < size
+        except (TypeError, ValueError):
+            raise ValueError('Координаты должны быть парой чисел (x, y)') from None
+        if not inside:
+            raise ValueError('Координаты выходят за поле')
+        coord = x, y
+        hit_points = self._hit_points_human if gamer is self.human else self._hit_points_comp
+        if coord in hit_points:
+            raise ValueError('Координаты уже использовались')
+
+        shell_place = self.recognize_shell_place(coord, gamer)  # определение места попадания снаряда
+        hit_points.add(coord)  # и сохранение координат места в список
+        opponent = self.computer if gamer is self.human else self.human
+
+        if shell_place is None:
+            if opponent.has_listeners:
+                opponent.emit(Event(Event.MISS, opponent, coord, None, None))
+            return self.MISS, None
+
+        self._marked_broken_ship_part(gamer, shell_place, coord)
+        opponent.update_cell(coord)  # обновление клетки на поле соперника
+        result = self.HIT if shell_place else self.SUNK
+        if opponent.has_listeners:
+            index = opponent.get_ship_part(coord)[2]
+            opponent.emit(Event(Event.HIT if result == self.HIT else Event.SUNK, opponent, coord, index, None))
+        if self._listeners and result == self.SUNK and gamer:  # все корабли соперника уничтожены
+            event = Event(Event.GAME_OVER, gamer, coord, None, None)
+            for listener in tuple(self._listeners):
+                listener(event)
+        return result, shell_place
+
+    def subscribe(self, listener):
+        """Метод для подписки на события партии: события обоих полей (выстрелы, перемещения, расстановка)
+        и окончание партии. listener(event) вызывается с объектом Event"""
+        self._listeners.append(listener)
+        self.computer.subscribe(listener)
+        self.human.subscribe(listener)
+
+    def unsubscribe(self, listener):
+        """Метод для отмены подписки listener"""
+        self._listeners.remove(listener)
+        self.computer.unsubscribe(listener)
+        self.human.unsubscribe(listener)
+
+    def get_shots(self, gamer: GamePole) -> set:
+        """Метод для получения множества координат, в которые стрелял игрок gamer (изменять нельзя)"""
+        return self._hit_points_human if gamer is self.human else self._hit_points_comp
+
+    def count_shots(self, gamer: GamePole) -> int:
+        """Метод для получения количества выстрелов, сделанных игроком gamer"""
+        return len(self._hit_points_human if gamer is self.human else self._hit_points_comp)
+
+    def turn(self, coord: tuple, moving: bool = False) -> tuple:
+        """Метод для одного хода партии человека с компьютером без ввода-вывода:
+        выстрел человека в клетку coord (с отметкой на поле результатов), ответный выстрел компьютера
+        и при moving=True - перемещение кораблей обоих полей, если партия не окончена.
+        Возвращает результат выстрела человека, ответ компьютера (координаты и результат или None)
+        и поле победителя (None - партия продолжается). Если компьютеру или человеку стрелять больше некуда
+        (например, перемещенные корабли оказались в обстрелянных клетках) - ничья DRAW, как в play().
+        Неверные координаты - ValueError, как в shoot().
+        Время хода учитывается в таймере 'turn'"""
+        if not self._stats.enabled:
+            return self._turn(coord, moving)
+        start = time.perf_counter()
+        outcome = self._turn(coord, moving)
+        self._stats.observe('turn', time.perf_counter() - start)
+        return outcome
+
+    def _turn(self, coord: tuple, moving: bool) -> tuple:
+        """Метод для хода без замера времени (см. turn)"""
+        result, _ = self.shoot(self.human, coord)
+        self._shot_marks[tuple(coord)] = '*' if result == self.MISS else 'X'
+        if self.human:  # все корабли компьютера уничтожены
+            return result, None, self.human
+
+        reply = self.computer_shoot()
+        if self.computer:  # все корабли человека уничтожены
+            return result, reply, self.computer
+        if reply is None or self.count_shots(self.human) == self._size_field ** 2:
+            return result, reply, self.DRAW
+        if moving:
+            self.computer.move_ships()
+            self.human.move_ships()
+        return result, reply, None
+
+    def play(self, human: Shooter, computer: Shooter, moving: bool = False, log=None) -> Union[GamePole, None]:
+        """Метод для проведения партии без ввода-вывода: за обоих игроков стреляют стратегии human и computer.
+        При moving=True после каждого хода соперников корабли перемещаются.
+        log - журнал партии (gamelog.GameLogWriter), в который записываются выстрелы и перемещения.
+        Возвращает поле победителя или None, если стрелять обоим больше некуда"""
+        while True:
+            for side, (gamer, shooter) in enumerate(((self.human, human), (self.computer, computer))):
+                coord = shooter.choose()
+                if coord is None:
+                    return None
+                result, ship = self.shoot(gamer, coord)
+                shooter.report(coord, result, ship)
+                if log is not None:
+                    log.shot(side, coord, result)
+                if gamer:  # если все корабли соперника уничтожены
+                    return gamer
+
+            if moving:
+                for side, pole in enumerate((self.human, self.computer)):
+                    moves = pole.move_ships()
+                    if log is not None and moves:
+                        log.moves(side, moves)
 
     def _marked_broken_ship_part(self, gamer: GamePole, shell_place: Ship, coord_place: tuple):
         """Метод реализует поиск подбитой палубы корабля и отмечает ее как уничтоженную"""
-        ships_coord = self._human_ships_coord if gamer is self.computer else self._comp_ships_coord
-        part_num = ships_coord.get(shell_place).index(coord_place)  # получаем номер палубы
+        opponent = self.computer if gamer is self.human else self.human
+        part_num = opponent.get_ship_part(coord_place)[1]  # получаем номер палубы
         shell_place[part_num] = 2  # и помечаем ее 'подбитой'
         shell_place.is_move = False
         if not shell_place:  # если корабль полностью уничтожен - увеличить счетчик уничтоженных кораблей
@@ -417,36 +1414,172 @@ class SeaBattle:
 
     def computer_go(self):
         """Метод для реализации хода компьютера
-         случайным образом в свободные клетки"""
-        while True:
-            x, y = randint(0, self._size_field - 1), randint(0, self._size_field - 1)
-            if (x, y) in self._hit_points_comp:
-                continue
-            break
-
-        shell_place = self.recognize_shell_place((x, y), self.computer)  # определение места попадания снаряда
-        self._hit_points_comp.append((x, y))  # и сохранение координат места в список
-
-        if shell_place is not None:  # если есть попадание в корабль
-            self._marked_broken_ship_part(self.computer, shell_place, (x, y))
-            self.human.update_game_field()  # обновление поля и его отображение
-        self.human.show()
+         по карте плотности вероятности расположения оставшихся кораблей"""
+        start = time.perf_counter() if self._stats.enabled else 0.0
+        self.computer_shoot()
+        self.show_boards()
+        if self._stats.enabled:
+            self._stats.observe('turn.computer', time.perf_counter() - start)
+
+    def computer_shoot(self) -> Union[tuple, None]:
+        """Метод для выстрела компьютера без ввода-вывода.
+        Возвращает координаты и результат выстрела или None, если стрелять больше некуда"""
+        coord = self._comp_shooter.choose()
+        if coord is None:
+            return None
+        result, ship = self.shoot(self.computer, coord)  # выстрел и обновление поля при попадании
+        self._comp_shooter.report(coord, result, ship)
+        return coord, result
 
     def show_shot_location(self, x: int, y: int, state: str):
         """Метод отображает поле с местом попадания снаряда после выстрела
         Поле отображается только после хода человека; X - было попадание в корабль;
         * - выстрел мимо"""
-        self.result_field[y][x] = state
-
-        print(' '.join(chr(i) for i in range(97, 97 + self._size_field)))
-        print('-' * (self._size_field * 2 - 1))
+        self._shot_marks[x, y] = state
+        if self._renderer.enabled:
+            self._renderer.show_board(self.result_field)
 
-        for i, row in enumerate(self.result_field, 1):
-            print(f'{" ".join(str(s) for s in row)}  {i}')
-        print('_' * (self._size_field * 2 - 1))
-        print()
+    def show_boards(self):
+        """Метод отображает рядом поле человека и поле с результатами его выстрелов.
+        Ходы человека и компьютера выводят этот кадр, поэтому его расположение не меняется
+        и AnsiRenderer перерисовывает только изменившиеся клетки"""
+        if self._renderer.enabled:
+            self._renderer.show_boards(self.human.get_pole(), self.result_field, self.human.name, self.computer.name)
 
     def __bool__(self):
         """Метод определяет окончание битвы.
-        Если кто-то уничтожил все 10 кораблей - игра останавливается"""
-        return not self.human and not self.computer
\ No newline at end of file
+        Если кто-то уничтожил все корабли соперника - игра останавливается"""
+        return not self.human and not self.computer
+
+
+class _Fleet:
+    """Неизменяемое расположение кораблей одного поля, общее у всех копий GameState"""
+
+    __slots__ = ('size', 'lengths', 'cells', 'masks')
+
+    def __init__(self, size: int, fleet: tuple, layout: tuple):
+        self.size = size
+        self.lengths = tuple(fleet)
+        self.cells = {}  # координаты палубы -> номер корабля
+        masks = []  # битовая маска клеток каждого корабля (бит y * size + x)
+        for index, (length, (x, y, tp)) in enumerate(zip(fleet, layout)):
+            mask = 0
+            for k in range(length):
+                cell = (x + k, y) if tp == Ship.HORIZONTAL else (x, y + k)
+                self.cells[cell] = index
+                mask |= 1 << cell[1] * size + cell[0]
+            masks.append(mask)
+        self.masks = tuple(masks)
+
+
+class GameState:
+    """Состояние партии для перебора вариантов: выстрелы сторон, попадания и уничтоженные корабли.
+    Сторона 0 - человек (стреляет по полю компьютера), 1 - компьютер (стреляет по полю человека).
+    Расположение кораблей общее у всех копий, выстрелы и попадания хранятся битовыми масками,
+    поэтому fork(), apply_shot() и undo() не зависят от числа кораблей и сделанных выстрелов.
+    Перемещение кораблей в состоянии не моделируется"""
+
+    __slots__ = ('_fleets', '_shots', '_hits', '_dead', '_history')
+
+    MISS, HIT, SUNK = SeaBattle.MISS, SeaBattle.HIT, SeaBattle.SUNK
+
+    def __init__(self, size: int, fleet: tuple, human_layout: tuple, computer_layout: tuple):
+        self._fleets = _Fleet(size, fleet, human_layout), _Fleet(size, fleet, computer_layout)
+        self._shots = [0, 0]  # клетки, в которые стреляла сторона
+        self._hits = [0, 0]  # клетки кораблей соперника, в которые попала сторона
+        self._dead = [0, 0]  # количество уничтоженных стороной кораблей
+        self._history = None  # выстрелы для отмены: ((сторона, бит, номер корабля, результат), предыдущие)
+
+    @classmethod
+    def from_game(cls, game: SeaBattle) -> 'GameState':
+        """Метод для получения состояния текущей партии game"""
+        fleet = tuple(ship.length for ship in game.human.ships)
+        state = cls(game.human.size, fleet, game.human.get_layout(), game.computer.get_layout())
+        size = game.human.size
+        for side, (gamer, opponent) in enumerate(((game.human, game.computer), (game.computer, game.human))):
+            state._shots[side] = sum(1 << y * size + x for x, y in game.get_shots(gamer))
+            hits = 0
+            for ship in opponent.ships:
+                x, y = ship.get_start_coords()
+                for k in range(ship.length):
+                    if ship[k] == 2:
+                        hits |= 1 << (y * size + x + k if ship.tp == Ship.HORIZONTAL else (y + k) * size + x)
+            state._hits[side] = hits
+            state._dead[side] = gamer.count_dead_ships
+        return state
+
+    def fork(self) -> 'GameState':
+        """Метод для получения независимой копии состояния"""
+        state = GameState.__new__(GameState)
+        state._fleets = self._fleets
+        state._shots = self._shots[:]
+        state._hits = self._hits[:]
+        state._dead = self._dead[:]
+        state._history = self._history
+        return state
+
+    def apply_shot(self, side: int, coord: tuple) -> int:
+        """Метод для выстрела стороны side в клетку coord. Возвращает MISS, HIT или SUNK"""
+        fleet = self._fleets[1 - side]
+        try:
+            x, y = coord
+            inside = 0 <= x < fleet.size and 0 <= y < fleet.size
+        except (TypeError, ValueError):
+            raise ValueError('Координаты должны быть парой чисел (x, y)') from None
+        if not inside:
+            raise ValueError('Координаты выходят за поле')
+        coord = x, y
+        bit = 1 << y * fleet.size + x
+        if self._shots[side] & bit:
+            raise ValueError('Координаты уже использовались')
+        self._shots[side] |= bit
+
+        index = fleet.cells.get(coord)
+        if index is None:
+            result = self.MISS
+        else:
+            hits = self._hits[side] = self._hits[side] | bit
+            if fleet.masks[index] & ~hits:
+                result = self.HIT
+            else:
+                result = self.SUNK
+                self._dead[side] += 1
+        self._history = (side, bit, index, result), self._history
+        return result
+
+    def undo(self):
+        """Метод для отмены последнего выстрела (в том числе сделанного до fork())"""
+        if self._history is None:
+            raise IndexError('Нет выстрелов для отмены')
+        (side, bit, index, result), self._history = self._history
+        self._shots[side] ^= bit
+        if index is not None:
+            self._hits[side] ^= bit
+            if result == self.SUNK:
+                self._dead[side] -= 1
+
+    def is_shot(self, side: int, coord: tuple) -> bool:
+        """Метод для проверки, стреляла ли сторона side в клетку coord"""
+        size = self._fleets[side].size
+        return bool(self._shots[side] >> coord[1] * size + coord[0] & 1)
+
+    def count_shots(self, side: int) -> int:
+        """Количество выстрелов стороны side"""
+        return self._shots[side].bit_count()
+
+    def dead_ships(self, side: int) -> int:
+        """Количество кораблей соперника, уничтоженных стороной side"""
+        return self._dead[side]
+
+    def remaining_ships(self, side: int) -> tuple:
+        """Длины кораблей соперника, которые стороне side осталось уничтожить"""
+        fleet, hits = self._fleets[1 - side], self._hits[side]
+        return tuple(length for length, mask in zip(fleet.lengths, fleet.masks) if mask & ~hits)
+
+    @property
+    def winner(self):
+        """Сторона, уничтожившая все корабли соперника, или None"""
+        for side in 0, 1:
+            if self._dead[side] == len(self._fleets[1 - side].lengths):
+                return side
+        return None
@@ -0,0 +1,250 @@
+"""Пакетная генерация расстановок кораблей для наборов данных.
+
+generate_layouts - построчный путь на целых числах Python, numpy не нужен;
+generate_boards - векторизованный путь: все поля пакета обрабатываются одновременно
+                  и возвращаются массивом (N, size, size) из uint8 (1 - палуба корабля).
+
+Оба пути дают одинаковые расстановки при одинаковом seed: строки поля хранятся
+битовыми масками, запрещенные клетки - маска кораблей, расширенная на одну клетку
+во все стороны, а каждый корабль ставится в позицию с номером floor(u * count)
+среди допустимых (сначала горизонтальные, затем вертикальные, по строкам),
+где u - очередное число генератора random.Random(seed), count - количество допустимых позиций.
+Поля, на которых какой-то корабль поставить некуда, расставляются заново следующим проходом
+в порядке номеров полей.
+
+Пример:
+    boards, ids = generate_boards(100000, seed=1, ship_ids=True)
+    pole.init(generate_layouts(1, seed=1)[0])
+"""
+import random
+
+from SeaBattle import GamePole, Ship
+
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для generate_boards
+    np = None
+
+MAX_PASSES = GamePole.MAX_PLACEMENT_RESTARTS + 1  # предельное число проходов расстановки
+NUMPY_SIZE_LIMIT = 64  # строка поля хранится в uint64
+CHUNK = 4096  # количество полей, обрабатываемых векторизованным путем за раз (чтобы массивы помещались в кэш)
+
+
+def _uniforms(rng: random.Random, boards: int, ships: int) -> list:
+    """Функция для получения чисел генератора для одного прохода: ships чисел на каждое поле по порядку"""
+    return [[rng.random() for _ in range(ships)] for _ in range(boards)]
+
+
+def _place_board(size: int, fleet: tuple, uniforms: list) -> tuple:
+    """Функция для расстановки кораблей одного поля по числам uniforms.
+    Возвращает расстановку ((x, y, ориентация), ...) или None, если какой-то корабль поставить некуда"""
+    full = (1 << size) - 1
+    halo = [0] * size  # запрещенные клетки: корабли и клетки вокруг них
+    layout = []
+    for length, u in zip(fleet, uniforms):
+        free = [~row & full for row in halo]
+        horizontal = []
+        for row in free:
+            window = row
+            for j in range(1, length):
+                window &= row >> j
+            horizontal.append(window & (1 << size - length + 1) - 1 if length <= size else 0)
+        vertical = [0] * size
+        if length > 1:
+            for y in range(size - length + 1):
+                window = free[y]
+                for j in range(1, length):
+                    window &= free[y + j]
+                vertical[y] = window
+
+        candidates = horizontal + vertical
+        count = sum(word.bit_count() for word in candidates)
+        if not count:
+            return None
+        rank = int(u * count)
+        for index, word in enumerate(candidates):
+            bits = word.bit_count()
+            if rank < bits:
+                break
+            rank -= bits
+        for _ in range(rank):
+            word &= word - 1
+        x = (word & -word).bit_length() - 1
+        y = index % size
+        tp = Ship.HORIZONTAL if index < size else Ship.VERTICAL
+        layout.append((x, y, tp))
+
+        # клетки корабля и вокруг него становятся запрещенными
+        if tp == Ship.HORIZONTAL:
+            rows, bits = range(max(y - 1, 0), min(y + 1, size - 1) + 1), ((1 << length + 2) - 1) << x >> 1
+        else:
+            rows, bits = range(max(y - 1, 0), min(y + length, size - 1) + 1), 7 << x >> 1
+        for r in rows:
+            halo[r] |= bits & full
+    return tuple(layout)
+
+
+def generate_layouts(n: int, size: int = 10, fleet: tuple = GamePole.FLEET, seed: int = None) -> list:
+    """Функция для получения n случайных расстановок флота fleet на поле size x size.
+    Каждая расстановка - кортеж (x, y, ориентация) для каждого корабля, как в GamePole.get_layout()"""
+    fleet = tuple(fleet)
+    rng = random.Random(seed)
+    layouts = [None] * n
+    pending = list(range(n))  # поля, которые еще не расставлены
+    for _ in range(MAX_PASSES):
+        if not pending:
+            return layouts
+        for index, uniforms in zip(pending, _uniforms(rng, len(pending), len(fleet))):
+            layouts[index] = _place_board(size, fleet, uniforms)
+        pending = [index for index in pending if layouts[index] is None]
+    if pending:
+        raise ValueError('Не удалось расставить корабли на поле такого размера')
+    return layouts
+
+
+def _uniforms_array(rng: random.Random, boards: int, ships: int):
+    """Функция для получения тех же чисел, что и _uniforms, массивом (boards, ships).
+    random() строится из двух 32-битных чисел генератора a и b как ((a >> 5) * 2 ** 26 + (b >> 6)) / 2 ** 53,
+    а randbytes выдает те же 32-битные числа подряд, поэтому числа собираются сразу в массиве"""
+    words = np.frombuffer(rng.randbytes(8 * boards * ships), dtype='<u4').reshape(-1, 2)
+    high, low = (words[:, 0] >> 5).astype(np.float64), (words[:, 1] >> 6).astype(np.float64)
+    return ((high * 67108864.0 + low) / 9007199254740992.0).reshape(boards, ships)
+
+
+def _popcount(words):
+    """Функция для подсчета единичных битов каждого элемента массива uint64"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).astype(np.int64)
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+    return table[words[..., None].view(np.uint8).reshape(*words.shape, 8)].sum(axis=-1)
+
+
+def _place_batch(size: int, fleet: tuple, uniforms) -> tuple:
+    """Функция для одного прохода расстановки всех полей пакета.
+    uniforms - массив (N, количество кораблей). Возвращает массивы x, y, ориентаций (N, количество кораблей)
+    и маску полей, на которых расстановка не удалась"""
+    n = len(uniforms)
+    ones = np.uint64((1 << 64) - 1)
+    full = np.uint64((1 << size) - 1)
+    rows = np.arange(size)
+    boards = np.arange(n)
+    halo = np.zeros((n, size), dtype=np.uint64)
+    failed = np.zeros(n, dtype=bool)
+    xs, ys, tps = (np.zeros((n, len(fleet)), dtype=np.int64) for _ in range(3))
+
+    for k, length in enumerate(fleet):
+        free = ~halo & full
+        horizontal = free.copy()
+        for j in range(1, length):
+            horizontal &= free >> np.uint64(j)
+        horizontal &= np.uint64((1 << max(size - length + 1, 0)) - 1)
+        vertical = np.zeros_like(free)
+        if 1 < length <= size:
+            window = free[:, :size - length + 1].copy()
+            for j in range(1, length):
+                window &= free[:, j:j + size - length + 1]
+            vertical[:, :size - length + 1] = window
+
+        candidates = np.concatenate((horizontal, vertical), axis=1)
+        counts = _popcount(candidates)
+        cumulative = np.cumsum(counts, axis=1)
+        total = cumulative[:, -1]
+        failed |= total == 0
+        rank = (uniforms[:, k] * total).astype(np.int64)
+
+        # слово с нужной позицией и номер единичного бита в нем
+        index = np.argmax(cumulative > rank[:, None], axis=1)
+        rank -= cumulative[boards, index] - counts[boards, index]
+        word = candidates[boards, index]
+        low, high = np.zeros(n, dtype=np.int64), np.full(n, size - 1, dtype=np.int64)
+        while np.any(low < high):  # двоичный поиск наименьшего x, до которого включительно rank + 1 единиц
+            middle = (low + high) // 2
+            prefix = word << (63 - middle).astype(np.uint64)  # остаются только биты 0..middle
+            enough = _popcount(prefix) > rank
+            high = np.where(enough, middle, high)
+            low = np.where(enough, low, middle + 1)
+        x, y = low, index % size
+        is_horizontal = index < size
+        xs[:, k], ys[:, k] = x, y
+        tps[:, k] = np.where(is_horizontal, Ship.HORIZONTAL, Ship.VERTICAL)
+
+        # клетки корабля и вокруг него становятся запрещенными
+        shift = np.maximum(x - 1, 0).astype(np.uint64)
+        width = np.minimum(np.where(is_horizontal, length + 2, 3) - (x == 0), 64)
+        bits = ones >> (64 - width).astype(np.uint64) << shift
+        first = y - 1
+        last = np.where(is_horizontal, y + 1, y + length)
+        covered = (rows >= first[:, None]) & (rows <= last[:, None]) & ~failed[:, None]
+        halo |= np.where(covered, (bits & full)[:, None], np.uint64(0))
+
+    return xs, ys, tps, failed
+
+
+def _batch_layouts(n: int, size: int, fleet: tuple, seed: int) -> tuple:
+    """Функция для получения массивов x, y и ориентаций кораблей всех полей пакета"""
+    rng = random.Random(seed)
+    xs, ys, tps = (np.zeros((n, len(fleet)), dtype=np.int64) for _ in range(3))
+    pending = np.arange(n)
+    for _ in range(MAX_PASSES):
+        if not len(pending):
+            return xs, ys, tps
+        uniforms = _uniforms_array(rng, len(pending), len(fleet))
+        failed = []
+        for start in range(0, len(pending), CHUNK):
+            chunk = pending[start:start + CHUNK]
+            chunk_xs, chunk_ys, chunk_tps, chunk_failed = _place_batch(size, fleet, uniforms[start:start + CHUNK])
+            xs[chunk], ys[chunk], tps[chunk] = chunk_xs, chunk_ys, chunk_tps
+            failed.append(chunk_failed)
+        pending = pending[np.concatenate(failed)]
+    if len(pending):
+        raise ValueError('Не удалось расставить корабли на поле такого размера')
+    return xs, ys, tps
+
+
+def layouts_to_boards(layouts, size: int, fleet: tuple, ship_ids: bool = False):
+    """Функция для перевода расстановок (список или массивы x, y, ориентаций) в массив полей (N, size, size).
+    При ship_ids=True дополнительно возвращается массив номеров кораблей (0 - пусто, k + 1 - корабль k)"""
+    if isinstance(layouts, tuple) and len(layouts) == 3 and hasattr(layouts[0], 'shape'):
+        xs, ys, tps = layouts
+    else:
+        array = np.array(layouts, dtype=np.int64).reshape(len(layouts), len(fleet), 3)
+        xs, ys, tps = array[..., 0], array[..., 1], array[..., 2]
+    n = len(xs)
+    boards = np.zeros((n, size, size), dtype=np.uint8)
+    ids = np.zeros((n, size, size), dtype=np.uint16 if len(fleet) < 2 ** 16 else np.uint32) if ship_ids else None
+    index = np.arange(n)
+    for k, length in enumerate(fleet):
+        horizontal = tps[:, k] == Ship.HORIZONTAL
+        for j in range(length):
+            x = xs[:, k] + np.where(horizontal, j, 0)
+            y = ys[:, k] + np.where(horizontal, 0, j)
+            boards[index, y, x] = 1
+            if ids is not None:
+                ids[index, y, x] = k + 1
+    return (boards, ids) if ship_ids else boards
+
+
+def generate_layout_array(n: int, size: int = 10, fleet: tuple = GamePole.FLEET, seed: int = None):
+    """Функция для получения n случайных расстановок массивом (N, количество кораблей, 3) из (x, y, ориентация).
+    Расстановки совпадают с generate_layouts(n, size, fleet, seed)"""
+    if np is None:
+        raise ImportError('Для generate_layout_array нужен numpy')
+    fleet = tuple(fleet)
+    if size > NUMPY_SIZE_LIMIT:
+        return np.array(generate_layouts(n, size, fleet, seed), dtype=np.int64).reshape(n, len(fleet), 3)
+    return np.stack(_batch_layouts(n, size, fleet, seed), axis=-1)
+
+
+def generate_boards(n: int, size: int = 10, fleet: tuple = GamePole.FLEET, seed: int = None,
+                    ship_ids: bool = False):
+    """Функция для получения n случайных полей массивом (N, size, size) из uint8.
+    При ship_ids=True дополнительно возвращается массив номеров кораблей (0 - пусто, k + 1 - корабль k).
+    Расстановки совпадают с generate_layouts(n, size, fleet, seed)"""
+    if np is None:
+        raise ImportError('Для generate_boards нужен numpy')
+    fleet = tuple(fleet)
+    if size > NUMPY_SIZE_LIMIT:  # строка поля не помещается в uint64 - расстановка построчным путем
+        layouts = generate_layouts(n, size, fleet, seed)
+    else:
+        layouts = _batch_layouts(n, size, fleet, seed)
+    return layouts_to_boards(layouts, size, fleet, ship_ids)
@@ -0,0 +1,314 @@
+"""Набор замеров производительности "Морского боя" без ввода-вывода и сети.
+
+Замеряются расстановка кораблей (GamePole.init) на полях разного размера и плотности флота,
+перемещение кораблей, перерисовка поля, определение места попадания, ход компьютера и целые партии.
+Для каждого замера выводятся операции в секунду, перцентили времени одной операции
+и пиковое потребление памяти (tracemalloc).
+
+Пример запуска из консоли:
+    python -m bench -o results.json
+    python -m bench --baseline results.json --threshold 0.1
+Если какой-то замер медленнее сохраненного в baseline больше чем на threshold, код возврата - 1.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import batch
+from SeaBattle import GamePole, GridBoard, BitBoard, SparseBoard, SeaBattle, RandomShooter, DensityShooter
+from renderer import NullRenderer
+
+SIZES = (10, 32, 64, 128)  # размеры полей для замера расстановки
+DENSITIES = (0.1, 0.2)  # доля клеток поля, занятых кораблями
+BOARDS = (GridBoard, BitBoard, SparseBoard)  # хранилища поля для сравнения между собой
+
+
+def fleet_for(size: int, density: float) -> tuple:
+    """Функция для получения флота, занимающего примерно долю density клеток поля size x size.
+    Флот составляется из повторений стандартного флота (20 палуб)"""
+    decks = sum(GamePole.FLEET)
+    return GamePole.FLEET * max(1, round(density * size * size / decks))
+
+
+class Case:
+    """Замер одной операции: before() выполняется перед каждым вызовом и в замер не входит,
+    вызов экземпляра - замеряемая операция"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def before(self):
+        pass
+
+    def __call__(self):
+        raise NotImplementedError
+
+
+def board_suffix(board: type) -> str:
+    """Функция для получения части имени замера с хранилищем поля (пусто - хранилище по умолчанию)"""
+    return f'/board={board.__name__}' if board is not None else ''
+
+
+class InitCase(Case):
+    """Расстановка кораблей на поле size x size"""
+
+    def __init__(self, size: int, density: float, rng: random.Random, board: type = None):
+        super().__init__(f'init/size={size}/density={density}{board_suffix(board)}')
+        self._pole = GamePole(size, board, renderer=NullRenderer(), fleet=fleet_for(size, density), rng=rng)
+
+    def __call__(self):
+        self._pole.init()
+
+
+class MoveCase(Case):
+    """Перемещение всех кораблей поля на одну клетку"""
+
+    def __init__(self, size: int, rng: random.Random):
+        super().__init__(f'move_ships/size={size}')
+        self._pole = GamePole(size, renderer=NullRenderer(), fleet=fleet_for(size, 0.2), rng=rng)
+        self._pole.init()
+
+    def __call__(self):
+        self._pole.move_ships()
+
+
+class UpdateFieldCase(Case):
+    """Полная перерисовка поля по кораблям"""
+
+    def __init__(self, size: int, rng: random.Random, board: type = None):
+        super().__init__(f'update_game_field/size={size}{board_suffix(board)}')
+        self._pole = GamePole(size, board, renderer=NullRenderer(), fleet=fleet_for(size, 0.2), rng=rng)
+        self._pole.init()
+
+    def __call__(self):
+        self._pole.update_game_field()
+
+
+class MoveAndReadCase(Case):
+    """Перемещение кораблей и чтение всего поля (get_pole) - как при отображении хода"""
+
+    def __init__(self, size: int, rng: random.Random, board: type = None):
+        super().__init__(f'move_and_get_pole/size={size}{board_suffix(board)}')
+        self._pole = GamePole(size, board, renderer=NullRenderer(), fleet=fleet_for(size, 0.2), rng=rng)
+        self._pole.init()
+
+    def __call__(self):
+        self._pole.move_ships()
+        self._pole.get_pole()
+
+
+class RecognizeCase(Case):
+    """Определение корабля в случайной клетке поля соперника"""
+
+    def __init__(self, rng: random.Random):
+        super().__init__('recognize_shell_place/size=10')
+        self._rng = rng
+        self._game = SeaBattle(10, renderer=NullRenderer(), rng=rng)
+        self._game.init()
+        self._coord = (0, 0)
+
+    def before(self):
+        self._coord = self._rng.randrange(10), self._rng.randrange(10)
+
+    def __call__(self):
+        self._game.recognize_shell_place(self._coord, self._game.human)
+
+
+class ComputerGoCase(Case):
+    """Ход компьютера (выбор клетки по карте плотности, выстрел и обновление поля)"""
+
+    def __init__(self, rng: random.Random):
+        super().__init__('computer_go/size=10')
+        self._rng = rng
+        self._game = None
+
+    def before(self):
+        game = self._game
+        if game is None or game.computer or game.count_shots(game.computer) == 100:  # партия окончена
+            self._game = SeaBattle(10, renderer=NullRenderer(), rng=self._rng)
+            self._game.init()
+
+    def __call__(self):
+        self._game.computer_go()
+
+
+class GameCase(Case):
+    """Целая партия двух стратегий стрельбы"""
+
+    def __init__(self, shooter: type, moving: bool, rng: random.Random):
+        super().__init__(f'game/{shooter.__name__}{"/moving" if moving else ""}/size=10')
+        self._shooter = shooter
+        self._moving = moving
+        self._rng = rng
+        self._game = None
+
+    def before(self):
+        self._game = SeaBattle(10, renderer=NullRenderer(), rng=self._rng)
+        self._game.init()
+
+    def __call__(self):
+        rng = self._rng
+        self._game.play(self._shooter(10, rng=rng), self._shooter(10, rng=rng), self._moving)
+
+
+class BatchCase(Case):
+    """Пакетная генерация полей (batch.generate_boards), одна операция - пакет из n полей"""
+
+    def __init__(self, n: int, rng: random.Random):
+        super().__init__(f'generate_boards/n={n}/size=10')
+        self._n = n
+        self._rng = rng
+
+    def __call__(self):
+        batch.generate_boards(self._n, seed=self._rng.randrange(2 ** 32))
+
+
+def make_cases(rng: random.Random) -> list:
+    """Функция для создания всех замеров с общим генератором rng"""
+    cases = [InitCase(size, density, rng) for size in SIZES for density in DENSITIES
+             if density == DENSITIES[0] or fleet_for(size, density) != fleet_for(size, DENSITIES[0])]
+    cases += [MoveCase(size, rng) for size in (10, 64)]
+    cases += [UpdateFieldCase(size, rng) for size in (10, 64)]
+    # сравнение хранилищ: плотная расстановка и перерисовка на малом поле, подбор позиций на большом
+    cases += [InitCase(10, DENSITIES[0], rng, board) for board in BOARDS]
+    cases += [UpdateFieldCase(10, rng, board) for board in BOARDS]
+    cases += [MoveAndReadCase(10, rng, board) for board in BOARDS]
+    cases += [InitCase(128, DENSITIES[1], rng, board) for board in BOARDS]
+    cases += [RecognizeCase(rng), ComputerGoCase(rng)]
+    cases += [GameCase(RandomShooter, False, rng), GameCase(DensityShooter, False, rng),
+              GameCase(DensityShooter, True, rng)]
+    if batch.np is not None:
+        cases.append(BatchCase(10000, rng))
+    return cases
+
+
+def percentile(samples: list, p: float) -> float:
+    """Функция для получения перцентиля p (от 0 до 1) отсортированного списка"""
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def run_case(case: Case, min_time: float = 1.0, max_iterations: int = 100000, memory_iterations: int = 20) -> dict:
+    """Функция для замера case: вызовы повторяются, пока их суммарное время меньше min_time.
+    Пиковая память замеряется отдельно на memory_iterations вызовах, чтобы tracemalloc не искажал время"""
+    for _ in range(3):  # прогрев
+        case.before()
+        case()
+
+    samples = []
+    total = 0
+    clock = time.perf_counter_ns
+    while total < min_time * 1e9 and len(samples) < max_iterations:
+        case.before()
+        start = clock()
+        case()
+        elapsed = clock() - start
+        samples.append(elapsed)
+        total += elapsed
+    samples.sort()
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(memory_iterations):
+            case.before()
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            case()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - start)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': len(samples),
+        'ops_per_sec': len(samples) / total * 1e9 if total else float('inf'),
+        'mean_us': total / len(samples) / 1000,
+        'p50_us': percentile(samples, 0.5) / 1000,
+        'p90_us': percentile(samples, 0.9) / 1000,
+        'p99_us': percentile(samples, 0.99) / 1000,
+        'max_us': samples[-1] / 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def run(seed: int = 1, min_time: float = 1.0, pattern: str = None) -> dict:
+    """Функция для выполнения всех замеров (или только тех, в имени которых есть pattern)"""
+    results = {}
+    for case in make_cases(random.Random(seed)):
+        if pattern is None or pattern in case.name:
+            results[case.name] = run_case(case, min_time)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'seed': seed,
+            'min_time': min_time,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.1) -> list:
+    """Функция для сравнения результатов с baseline.
+    Возвращает список (имя, отношение скоростей) для замеров, ставших медленнее больше чем на threshold"""
+    regressions = []
+    for name, current in results['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        ratio = current['ops_per_sec'] / base['ops_per_sec']
+        if ratio < 1 - threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def format_table(results: dict, baseline: dict = None) -> str:
+    """Функция для получения таблицы результатов (и отношения к baseline, если он передан)"""
+    width = max([36] + [len(name) for name in results['results']])
+    lines = [f'{"замер":<{width}} {"оп/с":>12} {"p50 мкс":>10} {"p99 мкс":>10} {"КиБ":>9}' +
+             (f' {"к baseline":>11}' if baseline else '')]
+    for name, r in results['results'].items():
+        line = f'{name:<{width}} {r["ops_per_sec"]:>12.1f} {r["p50_us"]:>10.1f} {r["p99_us"]:>10.1f} {r["peak_kib"]:>9.1f}'
+        if baseline:
+            base = baseline['results'].get(name)
+            line += f' {r["ops_per_sec"] / base["ops_per_sec"]:>10.2f}x' if base else f' {"-":>11}'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замеры производительности "Морского боя"')
+    parser.add_argument('-o', '--output', default=None, help='файл для сохранения результатов в JSON')
+    parser.add_argument('--baseline', default=None, help='файл с результатами для сравнения')
+    parser.add_argument('--threshold', type=float, default=0.1, help='допустимое замедление относительно baseline')
+    parser.add_argument('--min-time', type=float, default=1.0, help='минимальное время одного замера в секундах')
+    parser.add_argument('-k', '--filter', default=None, help='выполнять только замеры, в имени которых есть строка')
+    parser.add_argument('--seed', type=int, default=1, help='зерно генератора случайных чисел')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    results = run(args.seed, args.min_time, args.filter)
+    print(format_table(results, baseline))
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f'Замедление: {name} - {ratio:.2f} от baseline', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
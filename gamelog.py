@@ -0,0 +1,280 @@
+"""Компактный двоичный журнал партии и его воспроизведение.
+
+Формат файла (все числа - little-endian):
+    заголовок HEADER: метка b'SBLG', версия, размер поля, количество кораблей,
+                      интервал опорных кадров, зерно генератора (-1 - неизвестно)
+    длины кораблей флота: uint32 на каждый корабль
+    поток записей RECORD по 7 байт (вид, сторона, a, b - uint16, c):
+        SHOT     - выстрел стороны (0 - человек, 1 - компьютер) в клетку (a, b) с результатом c
+        MOVE     - перемещение корабля a стороны на c клеток
+        KEYFRAME - опорный кадр после хода a + b * 65536; за записью следует состояние кораблей обоих полей
+                   (SHIP на каждый корабль) и для каждой стороны выстрелы, сделанные после предыдущего
+                   опорного кадра: количество (uint32) и координаты x, y (uint16) каждого выстрела
+    указатель опорных кадров: пары (номер хода, смещение записи KEYFRAME) - uint64
+    окончание FOOTER: смещение указателя, количество опорных кадров, количество ходов, метка b'SBLE'
+
+Ход - один выстрел любой из сторон. Состояние на ходе N - после N-го выстрела
+и всех перемещений кораблей, записанных до следующего выстрела.
+Выстрелы к опорному кадру собираются из него и всех предыдущих кадров, поэтому размер журнала
+и время перехода к ходу зависят от числа выстрелов, а не от площади поля.
+Координаты и номера кораблей хранятся в uint16, поэтому поле - не больше MAX_SIZE,
+кораблей - не больше MAX_SHIPS, длина корабля - не больше 64 палуб.
+
+Пример:
+    python -m gamelog record game.sblog --seed 7 --moving
+    python -m gamelog show game.sblog --turn 40
+"""
+import argparse
+import mmap
+import random
+import struct
+from array import array
+from bisect import bisect_right
+
+from SeaBattle import GamePole, SeaBattle, DensityShooter
+from renderer import ConsoleRenderer, NullRenderer
+
+MAGIC = b'SBLG'
+END_MAGIC = b'SBLE'
+VERSION = 3
+
+HEADER = struct.Struct('<4sBIIIq')
+RECORD = struct.Struct('<BBHHb')
+SHIP = struct.Struct('<HHBQ')  # x, y, ориентация, битовая маска подбитых палуб
+FOOTER = struct.Struct('<QII4s')
+COUNT = struct.Struct('<I')  # количество выстрелов стороны в опорном кадре
+
+MAX_SIZE = 1 << 16  # координаты клеток - uint16
+MAX_SHIPS = 1 << 16  # номера кораблей в записях MOVE - uint16
+
+SHOT, MOVE, KEYFRAME = 1, 2, 3  # виды записей
+
+
+class GameLogWriter:
+    """Класс для записи журнала партии game.
+    Передается в SeaBattle.play(log=...) или вызывается вручную после каждого выстрела и перемещения"""
+
+    def __init__(self, path: str, game: SeaBattle, keyframe_interval: int = 64):
+        self._game = game
+        self._size = game.human.size
+        self._interval = keyframe_interval
+        self._turn = 0
+        self._index = array('Q')  # пары (номер хода, смещение опорного кадра)
+        # выстрелы сторон после последнего опорного кадра (x, y, x, y, ...); до первого кадра - все сделанные
+        self._shots = tuple(array('H', (value for coord in game.get_shots(gamer) for value in coord))
+                            for gamer in (game.human, game.computer))
+
+        ships = game.human.ships
+        if any(ship.length > 64 for ship in ships):
+            raise ValueError('Длина корабля в журнале не может быть больше 64 палуб')
+        if self._size > MAX_SIZE or len(ships) > MAX_SHIPS:
+            raise ValueError(f'Журнал поддерживает поля до {MAX_SIZE} клеток и флот до {MAX_SHIPS} кораблей')
+        self._file = open(path, 'wb')  # файл открывается только после проверок
+        seed = game.seed if game.seed is not None else -1
+        self._file.write(HEADER.pack(MAGIC, VERSION, self._size, len(ships), keyframe_interval, seed))
+        self._file.write(array('I', (ship.length for ship in ships)).tobytes())
+        self._keyframe()  # начальная расстановка кораблей
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def shot(self, side: int, coord: tuple, result: int):
+        """Метод для записи выстрела стороны side (0 - человек, 1 - компьютер)"""
+        self._file.write(RECORD.pack(SHOT, side, coord[0], coord[1], result))
+        self._shots[side].extend(coord)
+        self._turn += 1
+        if self._turn % self._interval == 0:
+            self._keyframe()
+
+    def moves(self, side: int, moves: list):
+        """Метод для записи перемещений кораблей поля стороны side (результат GamePole.move_ships)"""
+        self._file.write(b''.join(RECORD.pack(MOVE, side, index, 0, go) for index, go in moves))
+
+    def _keyframe(self):
+        """Метод для записи опорного кадра с состоянием кораблей и выстрелами после предыдущего кадра"""
+        game = self._game
+        self._index.extend((self._turn, self._file.tell()))
+        parts = [RECORD.pack(KEYFRAME, 0, self._turn & 0xFFFF, self._turn >> 16, 0)]
+        for pole in game.human, game.computer:
+            for ship in pole.ships:
+                hits = sum(1 << k for k in range(ship.length) if ship[k] == 2)
+                parts.append(SHIP.pack(ship.x, ship.y, ship.tp, hits))
+        for shots in self._shots:
+            parts.append(COUNT.pack(len(shots) // 2))
+            parts.append(shots.tobytes())
+            del shots[:]
+        self._file.write(b''.join(parts))
+
+    def close(self):
+        """Метод для записи указателя опорных кадров и закрытия файла"""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(self._index.tobytes())
+        self._file.write(FOOTER.pack(index_offset, len(self._index) // 2, self._turn, END_MAGIC))
+        self._file.close()
+
+
+class ReplayState:
+    """Состояние партии на заданном ходе: поля обоих игроков и множества выстрелов сторон"""
+
+    def __init__(self, turn: int, human: GamePole, computer: GamePole, shots: tuple):
+        self.turn = turn
+        self.human = human
+        self.computer = computer
+        self.shots = shots  # (выстрелы человека по полю компьютера, выстрелы компьютера по полю человека)
+
+
+class GameLogReader:
+    """Класс для чтения журнала партии через mmap.
+    Для перехода к ходу N берется ближайший предыдущий опорный кадр и применяются записи после него"""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.ships_count, self.keyframe_interval, seed = HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Файл не является журналом партии')
+        self.seed = seed if seed >= 0 else None
+        self.fleet = tuple(array('I', self._data[HEADER.size:HEADER.size + 4 * self.ships_count]))
+
+        index_offset, keyframes, self.turns, end_magic = FOOTER.unpack_from(self._data, len(self._data) - FOOTER.size)
+        if end_magic != END_MAGIC:
+            raise ValueError('Журнал партии не был закрыт')
+        index = array('Q', self._data[index_offset:index_offset + 16 * keyframes])
+        self._keyframe_turns = index[0::2]
+        self._keyframe_offsets = index[1::2]
+        self._records_end = index_offset
+        self._ships_size = 2 * self.ships_count * SHIP.size  # состояние кораблей в опорном кадре
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def state_at(self, turn: int) -> ReplayState:
+        """Метод для получения состояния партии после хода turn"""
+        turn = max(0, min(turn, self.turns))
+        k = bisect_right(self._keyframe_turns, turn) - 1
+        offset = self._keyframe_offsets[k]
+        state = self._read_keyframe(k)
+        offset = self._read_shots(offset)[1]
+
+        poles = state.human, state.computer
+        dirty = set()  # поля, на которых перемещались корабли (индекс палуб нужно перестроить)
+        data, end = self._data, self._records_end
+        while offset < end:
+            kind, side, a, b, c = RECORD.unpack_from(data, offset)
+            if kind == KEYFRAME:
+                offset = self._read_shots(offset)[1]
+                continue
+            if kind == SHOT:
+                if state.turn == turn:
+                    break
+                target = poles[1 - side]
+                if target in dirty:
+                    target.update_game_field()
+                    dirty.discard(target)
+                self._apply_shot(poles[side], target, (a, b))
+                state.shots[side].add((a, b))
+                state.turn += 1
+            elif kind == MOVE:
+                poles[side].ships[a].move(c)
+                dirty.add(poles[side])
+            offset += RECORD.size
+
+        for pole in dirty:
+            pole.update_game_field()
+        return state
+
+    def _new_pole(self) -> GamePole:
+        return GamePole(self.size, renderer=NullRenderer(), fleet=self.fleet, rng=random.Random(0))
+
+    def _read_shots(self, offset: int) -> tuple:
+        """Метод для чтения выстрелов сторон из опорного кадра по смещению offset.
+        Возвращает координаты выстрелов обеих сторон (x, y, x, y, ...) и смещение конца кадра"""
+        data = self._data
+        offset += RECORD.size + self._ships_size
+        shots = []
+        for _ in range(2):
+            count, = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            shots.append(array('H', data[offset:offset + 4 * count]))
+            offset += 4 * count
+        return shots, offset
+
+    def _read_keyframe(self, k: int) -> ReplayState:
+        """Метод для восстановления состояния из опорного кадра с номером k"""
+        data = self._data
+        offset = self._keyframe_offsets[k] + RECORD.size
+        poles = self._new_pole(), self._new_pole()
+        for pole in poles:
+            ships = [SHIP.unpack_from(data, offset + i * SHIP.size) for i in range(self.ships_count)]
+            offset += self.ships_count * SHIP.size
+            pole.init(tuple((x, y, tp) for x, y, tp, _ in ships))
+            for ship, (_, _, _, hits) in zip(pole.ships, ships):
+                for deck in range(ship.length):
+                    if hits >> deck & 1:
+                        ship[deck] = 2
+                if hits:
+                    ship.is_move = False
+            pole.update_game_field()
+        # количество уничтоженных кораблей соперника хранится в поле игрока-стрелка
+        poles[0].count_dead_ships = sum(1 for ship in poles[1].ships if not ship)
+        poles[1].count_dead_ships = sum(1 for ship in poles[0].ships if not ship)
+
+        shots = set(), set()
+        for keyframe in range(k + 1):
+            for cells, coords in zip(shots, self._read_shots(self._keyframe_offsets[keyframe])[0]):
+                cells.update(zip(coords[0::2], coords[1::2]))
+        return ReplayState(self._keyframe_turns[k], poles[0], poles[1], shots)
+
+    @staticmethod
+    def _apply_shot(gamer: GamePole, target: GamePole, coord: tuple):
+        """Метод для применения выстрела игрока gamer по полю target"""
+        part = target.get_ship_part(coord)
+        if part is None:
+            return
+        ship, k, _ = part
+        ship[k] = 2
+        ship.is_move = False
+        if not ship:
+            gamer.count_dead_ships += 1
+        target.update_cell(coord)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Запись и воспроизведение журнала партии')
+    parser.add_argument('mode', choices=('record', 'show'))
+    parser.add_argument('path', help='файл журнала')
+    parser.add_argument('--seed', type=int, default=None, help='зерно генератора для новой партии')
+    parser.add_argument('-s', '--size', type=int, default=10, help='размер поля')
+    parser.add_argument('--moving', action='store_true', help='перемещать корабли после каждого хода')
+    parser.add_argument('--turn', type=int, default=None, help='ход, состояние после которого показать')
+    args = parser.parse_args()
+
+    if args.mode == 'record':
+        game = SeaBattle(args.size, renderer=NullRenderer(), seed=args.seed)
+        game.init()
+        with GameLogWriter(args.path, game) as log:
+            shooters = DensityShooter(args.size, rng=game.rng), DensityShooter(args.size, rng=game.rng)
+            winner = game.play(*shooters, moving=args.moving, log=log)
+        print('Победитель:', winner.name if winner else 'нет')
+    else:
+        with GameLogReader(args.path) as reader:
+            state = reader.state_at(reader.turns if args.turn is None else args.turn)
+            print(f'Ход {state.turn} из {reader.turns}')
+            renderer = ConsoleRenderer()
+            renderer.show_boards(state.human.get_pole(), state.computer.get_pole(), 'Human', 'Computer')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Счетчики и таймеры горячих участков игры.
+
+Stats - сбор счетчиков и времени операций; NullStats - ничего не собирает (по умолчанию).
+GamePole и SeaBattle принимают объект stats и перед обращением к нему проверяют stats.enabled,
+поэтому с NullStats инструментирование стоит одну проверку атрибута.
+
+Пример:
+    stats = Stats()
+    game = SeaBattle(10, stats=stats)
+    stats.start_dump('stats.jsonl', interval=5)  # снимок в JSON lines каждые 5 секунд
+    ...
+    print(stats.snapshot())
+"""
+import json
+import threading
+import time
+from collections import Counter
+
+
+class Stats:
+    """Класс для сбора счетчиков и времени операций.
+    Время операций накапливается в гистограмме по степеням двойки микросекунд,
+    по ней в снимке оцениваются перцентили"""
+
+    enabled = True  # False - события не собираются и в горячих участках их можно не формировать
+
+    def __init__(self):
+        self._counters = Counter()
+        self._timers = {}  # имя -> [количество, суммарное время, наибольшее время, гистограмма]
+        self._dump_thread = None  # поток периодической записи и сигнал его остановки создаются в start_dump,
+        self._dump_stop = None  # чтобы объект (и хранящие его поля и партии) можно было копировать и сериализовать
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_dump_thread'] = state['_dump_stop'] = None  # копия периодическую запись не продолжает
+        return state
+
+    def count(self, name: str, n: int = 1):
+        """Метод для увеличения счетчика name на n"""
+        self._counters[name] += n
+
+    def observe(self, name: str, seconds: float):
+        """Метод для учета одного выполнения операции name длительностью seconds"""
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = [0, 0.0, 0.0, Counter()]
+        timer[0] += 1
+        timer[1] += seconds
+        if seconds > timer[2]:
+            timer[2] = seconds
+        timer[3][int(seconds * 1e6).bit_length()] += 1  # корзина k - не дольше 2 ** k микросекунд
+
+    @staticmethod
+    def _percentile(histogram: dict, total: int, p: float) -> float:
+        """Метод для оценки перцентиля p по гистограмме (верхняя граница корзины в микросекундах)"""
+        rank = p * total
+        seen = 0
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen >= rank:
+                return float(2 ** bucket)
+        return 0.0
+
+    def snapshot(self) -> dict:
+        """Метод для получения текущих значений счетчиков и таймеров"""
+        # копии делаются одним вызовом, чтобы снимок можно было брать из потока периодической записи
+        counters = dict(self._counters)
+        timers = [(name, (n, total, longest, dict(histogram))) for name, (n, total, longest, histogram)
+                  in list(self._timers.items())]
+        return {
+            'counters': dict(sorted(counters.items())),
+            'timers': {
+                name: {
+                    'count': n,
+                    'total_ms': total * 1000,
+                    'mean_us': total / n * 1e6,
+                    'p50_us': min(self._percentile(histogram, n, 0.5), longest * 1e6),
+                    'p99_us': min(self._percentile(histogram, n, 0.99), longest * 1e6),
+                    'max_us': longest * 1e6,
+                } for name, (n, total, longest, histogram) in sorted(timers)
+            },
+        }
+
+    def reset(self):
+        """Метод для обнуления всех счетчиков и таймеров"""
+        self._counters.clear()
+        self._timers.clear()
+
+    def dump(self, stream):
+        """Метод для записи снимка одной строкой JSON в поток stream"""
+        record = {'time': time.time(), **self.snapshot()}
+        stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        stream.flush()
+
+    def start_dump(self, path: str, interval: float = 10.0):
+        """Метод для запуска периодической записи снимков в файл path (JSON lines) в фоновом потоке"""
+        self.stop_dump()
+        stop = self._dump_stop = threading.Event()
+
+        def run():
+            with open(path, 'a', encoding='utf-8') as stream:
+                while not stop.wait(interval):
+                    self.dump(stream)
+                self.dump(stream)  # последний снимок при остановке
+
+        self._dump_thread = threading.Thread(target=run, name='stats-dump', daemon=True)
+        self._dump_thread.start()
+
+    def stop_dump(self):
+        """Метод для остановки периодической записи снимков"""
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread.join()
+            self._dump_thread = self._dump_stop = None
+
+
+class NullStats(Stats):
+    """Класс, ничего не собирающий"""
+
+    enabled = False
+
+    def __reduce__(self):
+        return 'NULL_STATS'  # при копировании и сериализации остается общий объект модуля
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def observe(self, name: str, seconds: float):
+        pass
+
+
+NULL_STATS = NullStats()  # общий объект по умолчанию
@@ -0,0 +1,186 @@
+"""Запас готовых расстановок кораблей для мгновенного начала партии.
+
+Расстановки хранятся в файле с записями фиксированной длины, отображенном в память (mmap).
+Файл - кольцевой буфер: выдача берет запись в голове, пополнение дописывает в хвост,
+а место выданных записей переиспользуется при следующем пополнении.
+Когда запас опускается ниже low_water, фоновый поток дополняет его до capacity.
+
+Формат файла (little-endian):
+    заголовок HEADER: метка b'SBLP', версия, размер поля, количество кораблей, емкость,
+                      номер следующей выдаваемой записи, номер следующей записываемой записи
+    длины кораблей флота: uint32 на каждый корабль
+    capacity записей: для каждого корабля x, y (uint16) и ориентация (uint8)
+
+Пример:
+    with LayoutPool('layouts.pool', capacity=100000) as pool:
+        game = SeaBattle(10)
+        game.init(pool)
+"""
+import mmap
+import os
+import random
+import struct
+import threading
+from array import array
+
+import batch
+from SeaBattle import GamePole
+
+MAGIC = b'SBLP'
+VERSION = 1
+
+HEADER = struct.Struct('<4sBIIIQQ')
+COUNTERS_OFFSET = 17  # смещение номеров выдачи и записи в заголовке
+COUNTERS = struct.Struct('<QQ')
+SHIP = 'HHB'  # x, y, ориентация одного корабля в записи
+CHUNK = 1024  # количество расстановок, генерируемых за одно пополнение (меньше - короче паузы выдачи)
+
+
+class LayoutPool:
+    """Класс запаса расстановок для полей size x size с флотом fleet.
+    Выдача take() - O(1); при пустом запасе расстановка генерируется на месте"""
+
+    def __init__(self, path: str, size: int = 10, fleet: tuple = GamePole.FLEET, capacity: int = 65536,
+                 low_water: int = None, seed: int = None, background: bool = True):
+        self._size = size
+        self._fleet = tuple(fleet)
+        self._capacity = capacity
+        self._low_water = low_water if low_water is not None else capacity // 4  # порог пополнения
+        self._rng = random.Random(seed)  # зерна пополнений
+        self._record = struct.Struct('<' + SHIP * len(self._fleet))
+        self._records_offset = HEADER.size + 4 * len(self._fleet)
+        self._lock = threading.Lock()  # номера выдачи и записи меняются из двух потоков
+        self._wanted = threading.Condition(self._lock)  # сигнал фоновому потоку о необходимости пополнения
+        self._refilling = threading.Lock()  # пополнения не выполняются одновременно
+        self._closed = False
+        self.served = 0  # количество выданных расстановок
+        self.generated = 0  # количество сгенерированных при пополнении
+        self.misses = 0  # количество выдач при пустом запасе
+
+        self._file, self._data = self._open(path)
+        self._head, self._tail = COUNTERS.unpack_from(self._data, COUNTERS_OFFSET)
+
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._refill_loop, name='layout-pool', daemon=True)
+            self._thread.start()
+
+    def _open(self, path: str) -> tuple:
+        """Метод для открытия файла запаса; файл с другим форматом, полем или флотом создается заново"""
+        length = self._records_offset + self._capacity * self._record.size
+        header = HEADER.pack(MAGIC, VERSION, self._size, len(self._fleet), self._capacity, 0, 0)
+        fleet = array('I', self._fleet).tobytes()
+
+        file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        current = file.read(self._records_offset)
+        if len(current) < self._records_offset or current[:COUNTERS_OFFSET] != header[:COUNTERS_OFFSET] or \
+                current[HEADER.size:] != fleet or os.fstat(file.fileno()).st_size != length:
+            file.seek(0)
+            file.truncate(length)
+            file.write(header + fleet)
+            file.flush()
+        return file, mmap.mmap(file.fileno(), length)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def fleet(self) -> tuple:
+        return self._fleet
+
+    def __len__(self):
+        """Количество готовых (еще не выданных) расстановок"""
+        return self._tail - self._head
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def take(self) -> tuple:
+        """Метод для выдачи следующей расстановки в формате GamePole.get_layout()"""
+        with self._lock:
+            if self._head == self._tail:
+                self.misses += 1
+                self._wanted.notify()
+                seed = self._rng.randrange(2 ** 63)
+            else:
+                offset = self._records_offset + self._head % self._capacity * self._record.size
+                values = self._record.unpack_from(self._data, offset)
+                self._head += 1
+                COUNTERS.pack_into(self._data, COUNTERS_OFFSET, self._head, self._tail)
+                self.served += 1
+                if self._tail - self._head < self._low_water:
+                    self._wanted.notify()
+                return tuple(zip(values[0::3], values[1::3], values[2::3]))
+        # запас пуст: генерация - без блокировки, чтобы не задерживать пополнение и другие выдачи
+        return batch.generate_layouts(1, self._size, self._fleet, seed)[0]
+
+    def refill(self, target: int = None) -> int:
+        """Метод для пополнения запаса до target расстановок (по умолчанию - до емкости).
+        Записи выданных расстановок перезаписываются. Возвращает количество добавленных расстановок"""
+        target = min(target if target is not None else self._capacity, self._capacity)
+        added = 0
+        with self._refilling:
+            while not self._closed:
+                with self._lock:
+                    count = min(target - (self._tail - self._head), CHUNK)
+                    seed = self._rng.randrange(2 ** 63)
+                if count <= 0:
+                    break
+                records = self._generate(count, seed)  # генерация - без блокировки, выдача в это время продолжается
+                with self._lock:
+                    if self._closed:
+                        break
+                    # место под новые записи освобождается только выдачей, поэтому уменьшиться оно не могло
+                    self._write(self._tail % self._capacity, records)
+                    self._tail += count
+                    COUNTERS.pack_into(self._data, COUNTERS_OFFSET, self._head, self._tail)
+                added += count
+                self.generated += count
+        return added
+
+    def _write(self, slot: int, records: bytes):
+        """Метод для записи подряд идущих записей, начиная с ячейки slot (с переходом в начало кольца)"""
+        size = self._record.size
+        first = min(len(records), (self._capacity - slot) * size)
+        offset = self._records_offset + slot * size
+        self._data[offset:offset + first] = records[:first]
+        if first < len(records):
+            self._data[self._records_offset:self._records_offset + len(records) - first] = records[first:]
+
+    def _generate(self, count: int, seed: int) -> bytes:
+        """Метод для получения count новых записей в двоичном виде"""
+        np = batch.np
+        if np is not None:
+            layouts = batch.generate_layout_array(count, self._size, self._fleet, seed)
+            records = np.empty((count, len(self._fleet)), dtype=[('x', '<u2'), ('y', '<u2'), ('tp', 'u1')])
+            records['x'], records['y'], records['tp'] = layouts[..., 0], layouts[..., 1], layouts[..., 2]
+            return records.tobytes()
+        layouts = batch.generate_layouts(count, self._size, self._fleet, seed)
+        return b''.join(self._record.pack(*(value for ship in layout for value in ship)) for layout in layouts)
+
+    def _refill_loop(self):
+        """Метод фонового потока: пополнение запаса, когда он опускается ниже low_water"""
+        while True:
+            with self._lock:
+                while not self._closed and self._tail - self._head >= self._low_water:
+                    self._wanted.wait()
+                if self._closed:
+                    return
+            self.refill()
+
+    def close(self):
+        """Метод для остановки пополнения и закрытия файла (выданные и готовые расстановки сохраняются)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wanted.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._data.flush()
+        self._data.close()
+        self._file.close()
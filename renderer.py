@@ -0,0 +1,134 @@
+"""Отображение игровых полей в консоли.
+
+ConsoleRenderer - вывод кадра одной записью в поток;
+AnsiRenderer - перерисовка только изменившихся символов с помощью ANSI-команд перемещения курсора;
+NullRenderer - ничего не выводит (для партий без ввода-вывода).
+"""
+import sys
+
+
+def column_label(index: int) -> str:
+    """Функция для получения буквенного обозначения столбца по индексу с нуля: a, ..., z, aa, ab, ..."""
+    label = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        label = chr(97 + rest) + label
+    return label
+
+
+class ConsoleRenderer:
+    """Класс для вывода игровых полей в консоль.
+    Заголовок с буквами столбцов и разделители кэшируются для каждого размера поля,
+    кадр собирается в одну строку и выводится одной записью"""
+
+    GAP = '    '  # промежуток между полями при выводе рядом
+    enabled = True  # False - вывод не производится и поля для него можно не строить
+
+    def __init__(self, stream=None):
+        self._stream = stream  # поток вывода (по умолчанию - текущий sys.stdout)
+        # размер поля -> (ширина клетки, заголовок, верхний разделитель, нижний разделитель)
+        self._frames = {}
+
+    def _frame(self, size: int) -> tuple:
+        """Метод для получения заголовка и разделителей поля размера size.
+        На полях шире 26 столбцов клетки расширяются до длины самого длинного обозначения столбца"""
+        frame = self._frames.get(size)
+        if frame is None:
+            cell = len(column_label(size - 1)) if size else 1
+            width = size * (cell + 1) - 1
+            header = ' '.join(column_label(i).ljust(cell) for i in range(size)).rstrip()
+            frame = self._frames[size] = cell, header, '-' * width, '_' * width
+        return frame
+
+    def board_lines(self, rows: tuple, title: str = None) -> list:
+        """Метод для получения строк изображения поля"""
+        size = len(rows)
+        cell, header, top, bottom = self._frame(size)
+        lines = [f'{title:^{size * (cell + 1)}}'] if title is not None else []
+        lines.append(header)
+        lines.append(top)
+        if cell == 1:
+            lines.extend(f'{" ".join(map(str, row))}  {i}' for i, row in enumerate(rows, 1))
+        else:
+            lines.extend(f'{" ".join(str(s).ljust(cell) for s in row)}  {i}' for i, row in enumerate(rows, 1))
+        lines.append(bottom)
+        lines.append('')
+        return lines
+
+    def show_board(self, rows: tuple, title: str = None):
+        """Метод для вывода одного поля"""
+        self._write_frame(self.board_lines(rows, title))
+
+    def show_boards(self, left_rows: tuple, right_rows: tuple, left_title: str = '', right_title: str = ''):
+        """Метод для вывода двух полей рядом"""
+        left = self.board_lines(left_rows, left_title)
+        right = self.board_lines(right_rows, right_title)
+        width = max(map(len, left))
+        if len(left) < len(right):
+            left += [''] * (len(right) - len(left))
+        right += [''] * (len(left) - len(right))
+        self._write_frame([f'{a:<{width}}{self.GAP}{b}'.rstrip() for a, b in zip(left, right)])
+
+    def _write_frame(self, lines: list):
+        """Метод для вывода кадра одной записью"""
+        stream = self._stream or sys.stdout
+        stream.write('\n'.join(lines) + '\n')
+        stream.flush()
+
+
+class AnsiRenderer(ConsoleRenderer):
+    """Класс для вывода игровых полей в терминал с поддержкой ANSI-команд.
+    Первый кадр выводится целиком с очисткой экрана, в следующих кадрах
+    курсор перемещается только к изменившимся символам"""
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._last = None  # строки предыдущего кадра
+
+    def _write_frame(self, lines: list):
+        last = self._last
+        self._last = lines
+        if last is None or len(last) != len(lines) or any(len(a) != len(b) for a, b in zip(last, lines)):
+            out = ['\x1b[2J\x1b[H', '\n'.join(lines)]  # расположение изменилось - перерисовка целиком
+        else:
+            out = []
+            for row, (old, new) in enumerate(zip(last, lines), 1):
+                if old == new:
+                    continue
+                col = 0
+                while col < len(new):
+                    if old[col] == new[col]:
+                        col += 1
+                        continue
+                    end = col
+                    while end < len(new) and old[end] != new[end]:  # подряд идущие изменения выводятся вместе
+                        end += 1
+                    out.append(f'\x1b[{row};{col + 1}H{new[col:end]}')
+                    col = end
+        out.append(f'\x1b[{len(lines) + 1};1H')  # курсор - под кадр
+        stream = self._stream or sys.stdout
+        stream.write(''.join(out))
+        stream.flush()
+
+    def reset(self):
+        """Метод для принудительной полной перерисовки следующего кадра"""
+        self._last = None
+
+
+class NullRenderer(ConsoleRenderer):
+    """Класс, ничего не выводящий на экран"""
+
+    enabled = False
+
+    def board_lines(self, rows: tuple, title: str = None) -> list:
+        return []
+
+    def show_board(self, rows: tuple, title: str = None):
+        pass
+
+    def show_boards(self, left_rows: tuple, right_rows: tuple, left_title: str = '', right_title: str = ''):
+        pass
+
+    def _write_frame(self, lines: list):
+        pass
@@ -0,0 +1,213 @@
+"""Сервер "Морского боя" на asyncio: много партий с компьютером в одном процессе.
+
+Протокол строковый, каждая команда и каждый ответ - одна строка в UTF-8:
+    a1      выстрел человека; ответ - результат выстрела (miss, hit или sunk),
+            затем ответный выстрел компьютера и его результат: 'hit c4 miss';
+            в конце ответа может стоять 'win', 'lose' или 'draw' (стрелять больше некуда) - партия окончена
+    board   состояние поля человека: 'board 0000100000/0110000000/...'
+    shots   результаты выстрелов человека: 'shots ----X-----/---*------/...'
+    quit    завершение сессии
+При ошибке сервер отвечает 'error <описание>'.
+
+Запуск сервера и нагрузочного клиента:
+    python -m server serve --port 8765 --pool layouts.pool --stats stats.jsonl
+    python -m server bench --port 8765 --sessions 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from instrumentation import Stats
+from layoutpool import LayoutPool
+from SeaBattle import GamePole, SeaBattle, RandomShooter
+from renderer import NullRenderer
+
+RESULTS = {SeaBattle.MISS: 'miss', SeaBattle.HIT: 'hit', SeaBattle.SUNK: 'sunk'}
+
+
+class GameSession:
+    """Класс для одной партии человека с компьютером без ввода-вывода.
+    Каждая сессия хранит собственное состояние игры.
+    Если передан запас расстановок pool - корабли расставляются готовыми расстановками из него.
+    В stats учитываются время ходов (таймер 'turn'), расстановки и перемещения кораблей"""
+
+    def __init__(self, size: int = 10, fleet: tuple = None, moving: bool = False, pool: LayoutPool = None,
+                 stats: Stats = None):
+        self._game = SeaBattle(size, renderer=NullRenderer(), fleet=fleet, stats=stats)
+        self._game.init(pool)
+        self._moving = moving  # перемещать корабли после каждого хода
+        self._finished = False
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def handle(self, line: str) -> str:
+        """Метод для обработки одной команды и получения строки ответа"""
+        command = line.strip().lower()
+        if command == 'board':
+            return 'board ' + '/'.join(''.join(map(str, row)) for row in self._game.human.get_pole())
+        if command == 'shots':
+            return 'shots ' + '/'.join(''.join(row) for row in self._game.result_field)
+        if self._finished:
+            return 'error партия окончена'
+
+        game = self._game
+        coord = game.parse_coord(command)
+        if coord is None:
+            return 'error неверные координаты'
+        try:
+            result, shot, winner = game.turn(coord, self._moving)
+        except ValueError as error:
+            return f'error {error}'
+
+        reply = [RESULTS[result]]
+        if shot is not None:
+            reply.append(game.format_coord(shot[0]))
+            reply.append(RESULTS[shot[1]])
+        if winner is not None:
+            self._finished = True
+            reply.append('draw' if winner is game.DRAW else 'win' if winner is game.human else 'lose')
+        return ' '.join(reply)
+
+
+class GameServer:
+    """Класс сервера: на каждое подключение создается своя сессия GameSession.
+    Счетчики и таймеры stats общие для всех сессий сервера"""
+
+    BACKLOG = 4096  # очередь ожидающих подключений (клиентов может быть тысячи одновременно)
+
+    def __init__(self, size: int = 10, fleet: tuple = None, moving: bool = False, pool: LayoutPool = None,
+                 stats: Stats = None):
+        self._size = size
+        self._fleet = fleet
+        self._moving = moving
+        self._pool = pool  # запас готовых расстановок (None - расстановка при каждом подключении)
+        self._stats = stats  # счетчики и таймеры сессий (None - не собираются)
+        self.sessions = 0  # количество открытых сессий
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Метод для обслуживания одного подключения"""
+        session = GameSession(self._size, self._fleet, self._moving, self._pool, self._stats)
+        self.sessions += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line or line.strip() == b'quit':
+                    break
+                writer.write(session.handle(line.decode('utf-8', 'replace')).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765, path: str = None):
+        """Метод для запуска сервера на TCP-порту или Unix-сокете path"""
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, path, backlog=self.BACKLOG)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port, backlog=self.BACKLOG)
+        async with server:
+            await server.serve_forever()
+
+
+async def _open(host: str, port: int, path: str) -> tuple:
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _play_client(host: str, port: int, path: str, size: int, latencies: list) -> int:
+    """Функция для проведения одной партии клиентом, стреляющим в случайные клетки.
+    Время ответа на каждый выстрел добавляется в latencies. Возвращает число выстрелов"""
+    reader, writer = await _open(host, port, path)
+    shooter = RandomShooter(size)
+    shots = 0
+    try:
+        while True:
+            coord = shooter.choose()
+            if coord is None:
+                break
+            start = time.perf_counter()
+            writer.write(SeaBattle.format_coord(coord).encode() + b'\n')
+            reply = (await reader.readline()).decode().split()
+            latencies.append(time.perf_counter() - start)
+            shots += 1
+            if not reply or reply[0] == 'error' or reply[-1] in ('win', 'lose', 'draw'):
+                break
+        writer.write(b'quit\n')
+        await writer.drain()
+    finally:
+        writer.close()
+    return shots
+
+
+async def load_test(sessions: int, host: str = '127.0.0.1', port: int = 8765, path: str = None,
+                    size: int = 10, concurrency: int = 1000) -> dict:
+    """Функция для нагрузочного теста: sessions партий, не более concurrency одновременно.
+    Возвращает количество выстрелов в секунду и задержки ответа (медиана, 99-й перцентиль) в миллисекундах"""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run():
+        async with semaphore:
+            return await _play_client(host, port, path, size, latencies)
+
+    start = time.perf_counter()
+    shots = sum(await asyncio.gather(*(run() for _ in range(sessions))))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {
+        'sessions': sessions,
+        'shots': shots,
+        'elapsed': elapsed,
+        'shots_per_sec': shots / elapsed if elapsed else float('inf'),
+        'latency_ms': {'p50': percentile(0.5), 'p99': percentile(0.99), 'max': percentile(1.0)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сервер "Морского боя" и нагрузочный клиент')
+    parser.add_argument('mode', choices=('serve', 'bench'), help='serve - сервер, bench - нагрузочный клиент')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='путь к Unix-сокету вместо TCP')
+    parser.add_argument('-s', '--size', type=int, default=10, help='размер поля')
+    parser.add_argument('--moving', action='store_true', help='перемещать корабли после каждого хода')
+    parser.add_argument('--pool', default=None, help='файл запаса готовых расстановок для сервера')
+    parser.add_argument('--stats', default=None, help='файл для периодической записи счетчиков и таймеров сервера')
+    parser.add_argument('--sessions', type=int, default=1000, help='количество партий нагрузочного клиента')
+    parser.add_argument('--concurrency', type=int, default=1000, help='количество одновременных партий')
+    args = parser.parse_args()
+
+    if args.mode == 'serve':
+        pool = LayoutPool(args.pool, args.size, GamePole.FLEET) if args.pool is not None else None
+        stats = None
+        if args.stats is not None:
+            stats = Stats()
+            stats.start_dump(args.stats)
+        try:
+            server = GameServer(args.size, moving=args.moving, pool=pool, stats=stats)
+            asyncio.run(server.serve(args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if pool is not None:
+                pool.close()
+            if stats is not None:
+                stats.stop_dump()
+    else:
+        stats = asyncio.run(load_test(args.sessions, args.host, args.port, args.unix, args.size, args.concurrency))
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Пакетное моделирование партий "Морского боя" без ввода-вывода.
+
+Пример запуска из консоли:
+    python -m simulation -n 100000 -w 4 --seed 1
+"""
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from SeaBattle import GamePole, SeaBattle, RandomShooter
+
+
+def _play_chunk(n_games: int, seed: int, size: int, human: type, computer: type, moving: bool,
+                fleet: tuple) -> tuple:
+    """Функция для проведения n_games партий в одном процессе с генератором, заданным seed"""
+    rng = random.Random(seed)
+    wins = Counter()  # победы: 'human', 'computer' или 'draw'
+    shots = {'human': Counter(), 'computer': Counter()}  # распределение числа выстрелов до победы
+
+    for _ in range(n_games):
+        game = SeaBattle(size, fleet=fleet, rng=rng)
+        game.init()
+        winner = game.play(human(size, fleet, rng), computer(size, fleet, rng), moving)
+        if winner is None:
+            wins['draw'] += 1
+            continue
+        side = 'human' if winner is game.human else 'computer'
+        wins[side] += 1
+        shots[side][game.count_shots(winner)] += 1
+
+    return wins, shots
+
+
+def simulate(n_games: int, workers: int = None, size: int = 10, human: type = RandomShooter,
+             computer: type = RandomShooter, moving: bool = False, seed: int = None,
+             chunk_size: int = 1000, fleet: tuple = GamePole.FLEET) -> dict:
+    """Функция для моделирования n_games партий в workers процессах.
+    human и computer - классы стратегий стрельбы (наследники Shooter), создаются с параметрами size, fleet и rng.
+    Каждая порция из chunk_size партий играется со своим генератором, зерно которого
+    получается из seed, поэтому при одинаковом seed результаты совпадают.
+    Возвращает словарь со статистикой: доли побед, распределение числа выстрелов до победы,
+    количество партий в секунду"""
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    workers = workers or os.cpu_count() or 1
+    fleet = tuple(fleet)
+    chunks = [(min(chunk_size, n_games - start), seed + i, size, human, computer, moving, fleet)
+              for i, start in enumerate(range(0, n_games, chunk_size))]
+
+    start_time = time.perf_counter()
+    if workers == 1:
+        results = [_play_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_play_chunk, *zip(*chunks)))
+    elapsed = time.perf_counter() - start_time
+
+    wins = Counter()
+    shots = {'human': Counter(), 'computer': Counter()}
+    for chunk_wins, chunk_shots in results:
+        wins.update(chunk_wins)
+        for side, counter in chunk_shots.items():
+            shots[side].update(counter)
+
+    return {
+        'games': n_games,
+        'seed': seed,
+        'workers': workers,
+        'elapsed': elapsed,
+        'games_per_sec': n_games / elapsed if elapsed else float('inf'),
+        'win_rate': {side: wins[side] / n_games if n_games else 0.0 for side in ('human', 'computer', 'draw')},
+        'shots_to_win': {side: dict(sorted(counter.items())) for side, counter in shots.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Моделирование партий "Морского боя" без ввода-вывода')
+    parser.add_argument('-n', '--games', type=int, default=10000, help='количество партий')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='количество процессов')
+    parser.add_argument('-s', '--size', type=int, default=10, help='размер поля')
+    parser.add_argument('--seed', type=int, default=None, help='зерно генератора случайных чисел')
+    parser.add_argument('--fleet', type=int, nargs='+', default=GamePole.FLEET, help='длины кораблей флота')
+    parser.add_argument('--moving', action='store_true', help='перемещать корабли после каждого хода')
+    args = parser.parse_args()
+
+    stats = simulate(args.games, args.workers, args.size, moving=args.moving, seed=args.seed, fleet=args.fleet)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""Потоковый режим: партии человека с компьютером по командам из файла, канала или итератора.
+
+Каждая строка входа - одна команда:
+    a1          выстрел человека; компьютер сразу отвечает своим выстрелом
+    new [seed]  новая партия (с зерном seed; без него - зерно из --seed и номера партии)
+    quit        завершение
+Пустые строки и строки, начинающиеся с '#', пропускаются. Если выстрел пришел
+до первой команды new, партия начинается автоматически.
+С запасом готовых расстановок (pool) корабли берутся из запаса, а не из зерна, поэтому
+зерно в этом случае задать нельзя: new с зерном отвечает ошибкой.
+
+На каждый выстрел выводится одна строка: JSON
+    {"game": 1, "turn": 1, "shot": "a1", "result": "miss", "reply": "c4", "reply_result": "hit"}
+или краткий текст '1 1 a1 miss c4 hit'; в конце партии добавляется "over": "win" / "lose" / "draw"
+(в тексте - слово win, lose или draw; draw - ничья, стрелять больше некуда). При ошибке - {"game": 1, "error": "..."} или '1 error ...'.
+
+Пример:
+    python -m stream --seed 1 < shots.txt > results.jsonl
+"""
+import argparse
+import json
+import sys
+
+from SeaBattle import SeaBattle
+from renderer import NullRenderer
+
+RESULTS = {SeaBattle.MISS: 'miss', SeaBattle.HIT: 'hit', SeaBattle.SUNK: 'sunk'}
+TABLE_SIZE_LIMIT = 256  # на полях большего размера координаты разбираются регулярным выражением
+
+
+class CoordTable:
+    """Таблицы перевода координат 'a1' <-> (x, y) для поля size x size, построенные один раз"""
+
+    def __init__(self, size: int):
+        self.labels = [SeaBattle.format_coord((x, y)) for y in range(size) for x in range(size)]
+        self.cells = {label: divmod(i, size)[::-1] for i, label in enumerate(self.labels)}
+        self._size = size
+
+    def parse(self, text: str):
+        return self.cells.get(text)
+
+    def format(self, coord: tuple) -> str:
+        return self.labels[coord[1] * self._size + coord[0]]
+
+
+class StreamPlayer:
+    """Класс для проведения партий по потоку команд без вывода полей.
+    fmt - формат вывода: 'json' или 'text'.
+    pool - запас готовых расстановок (layoutpool.LayoutPool); с ним зерно seed не задается,
+    так как расстановка партии определяется запасом, а не зерном"""
+
+    def __init__(self, size: int = 10, fleet: tuple = None, moving: bool = False, fmt: str = 'json',
+                 seed: int = None, pool=None):
+        if fmt not in ('json', 'text'):
+            raise ValueError('Формат вывода должен быть json или text')
+        if pool is not None and seed is not None:
+            raise ValueError('С запасом расстановок зерно не определяет партию')
+        self._size = size
+        self._fleet = fleet
+        self._moving = moving
+        self._json = fmt == 'json'
+        self._seed = seed
+        self._pool = pool  # запас готовых расстановок (layoutpool.LayoutPool)
+        self._table = CoordTable(size) if size <= TABLE_SIZE_LIMIT else None
+        self._game = None
+        self._finished = False
+        self.games = 0  # количество начатых партий
+        self.turns = 0  # количество ходов в текущей партии
+        self.wins = 0  # количество побед человека
+        self.losses = 0  # количество поражений человека
+        self.draws = 0  # количество ничьих
+
+    def new_game(self, seed: int = None):
+        """Метод для начала новой партии"""
+        self.games += 1
+        if seed is None and self._seed is not None:
+            seed = self._seed + self.games - 1
+        self._game = SeaBattle(self._size, renderer=NullRenderer(), fleet=self._fleet, seed=seed)
+        self._game.init(self._pool)
+        self._finished = False
+        self.turns = 0
+
+    def _parse(self, text: str):
+        if self._table is not None:
+            coord = self._table.parse(text)
+            if coord is not None:
+                return coord
+        # в таблице только канонические записи ('a1'), остальные ('a01') разбираются как на любом поле
+        return self._game.parse_coord(text)
+
+    def _format(self, coord: tuple) -> str:
+        return self._table.format(coord) if self._table is not None else SeaBattle.format_coord(coord)
+
+    def _error(self, message: str) -> str:
+        if self._json:
+            return json.dumps({'game': self.games, 'error': message}, ensure_ascii=False)
+        return f'{self.games} error {message}'
+
+    def handle(self, line: str):
+        """Метод для обработки одной команды. Возвращает строку вывода или None, если выводить нечего"""
+        command = line.strip().lower()
+        if not command or command[0] == '#':
+            return None
+        if command.startswith('new'):
+            argument = command[3:].strip()
+            if argument and not argument.lstrip('-').isdigit():
+                return self._error('неверное зерно')
+            if argument and self._pool is not None:
+                return self._error('с запасом расстановок зерно не определяет партию')
+            self.new_game(int(argument) if argument else None)
+            return None
+
+        if self._game is None:
+            self.new_game()
+        if self._finished:
+            return self._error('партия окончена')
+        game = self._game
+        coord = self._parse(command)
+        if coord is None:
+            return self._error('неверные координаты')
+        try:
+            result, reply, winner = game.turn(coord, self._moving)
+        except ValueError as error:
+            return self._error(str(error))
+        self.turns += 1
+
+        over = None
+        if winner is not None:
+            self._finished = True
+            if winner is game.DRAW:
+                over = 'draw'
+                self.draws += 1
+            elif winner is game.human:
+                over = 'win'
+                self.wins += 1
+            else:
+                over = 'lose'
+                self.losses += 1
+
+        if self._json:
+            record = {'game': self.games, 'turn': self.turns, 'shot': command, 'result': RESULTS[result]}
+            if reply is not None:
+                record['reply'] = self._format(reply[0])
+                record['reply_result'] = RESULTS[reply[1]]
+            if over is not None:
+                record['over'] = over
+            return json.dumps(record)
+        parts = [str(self.games), str(self.turns), command, RESULTS[result]]
+        if reply is not None:
+            parts += [self._format(reply[0]), RESULTS[reply[1]]]
+        if over is not None:
+            parts.append(over)
+        return ' '.join(parts)
+
+    def run(self, lines, out) -> dict:
+        """Метод для обработки всех команд из итератора строк lines с записью результатов в поток out.
+        Возвращает итоги: количество партий, побед, поражений и ничьих"""
+        write = out.write
+        for line in lines:
+            if line.strip().lower() == 'quit':
+                break
+            reply = self.handle(line)
+            if reply is not None:
+                write(reply + '\n')
+        out.flush()
+        return {'games': self.games, 'wins': self.wins, 'losses': self.losses, 'draws': self.draws}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Потоковый режим "Морского боя": команды из файла или канала')
+    parser.add_argument('-i', '--input', default=None, help='файл с командами (по умолчанию - стандартный ввод)')
+    parser.add_argument('-o', '--output', default=None, help='файл для результатов (по умолчанию - стандартный вывод)')
+    parser.add_argument('--format', choices=('json', 'text'), default='json', help='формат вывода')
+    parser.add_argument('-s', '--size', type=int, default=10, help='размер поля')
+    parser.add_argument('--seed', type=int, default=None, help='зерно генератора первой партии')
+    parser.add_argument('--moving', action='store_true', help='перемещать корабли после каждого хода')
+    args = parser.parse_args()
+
+    source = open(args.input, encoding='utf-8') if args.input is not None else sys.stdin
+    target = open(args.output, 'w', encoding='utf-8') if args.output is not None else sys.stdout
+    try:
+        player = StreamPlayer(args.size, moving=args.moving, fmt=args.format, seed=args.seed)
+        summary = player.run(source, target)
+    finally:
+        if args.input is not None:
+            source.close()
+        if args.output is not None:
+            target.close()
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+import batch
+from SeaBattle import GamePole
+
+np = batch.np
+needs_numpy = pytest.mark.skipif(np is None, reason='numpy не установлен')
+
+
+@needs_numpy
+@pytest.mark.parametrize('size', (7, 10, 20, 64))
+def test_numpy_path_matches_scalar(size):
+    layouts = batch.generate_layouts(300, size, seed=size)
+    array = batch.generate_layout_array(300, size, seed=size)
+    assert array.tolist() == [[list(ship) for ship in layout] for layout in layouts]
+
+
+@needs_numpy
+def test_boards_match_layouts():
+    fleet = GamePole.FLEET * 2
+    layouts = batch.generate_layouts(200, 12, fleet, seed=5)
+    boards, ids = batch.generate_boards(200, 12, fleet, seed=5, ship_ids=True)
+    expected, expected_ids = batch.layouts_to_boards(layouts, 12, fleet, ship_ids=True)
+    assert np.array_equal(boards, expected) and np.array_equal(ids, expected_ids)
+    assert (boards.sum(axis=(1, 2)) == sum(fleet)).all()
+
+
+@pytest.mark.parametrize('size', (7, 10, 64))
+def test_layouts_are_legal(size):
+    pole = GamePole(size, rng=random.Random(0))
+    for layout in batch.generate_layouts(200, size, seed=1):
+        pole.init(layout)  # ValueError, если корабли выходят за поле или касаются
+        assert pole.get_layout() == layout
+    if np is not None:
+        for layout in batch.generate_layout_array(200, size, seed=2).tolist():
+            pole.init(tuple(map(tuple, layout)))
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from gamelog import COUNT, FOOTER, HEADER, RECORD, SHIP, GameLogReader, GameLogWriter
+from renderer import NullRenderer
+from SeaBattle import GamePole, SeaBattle, DensityShooter, RandomShooter
+
+
+def snapshot(human: GamePole, computer: GamePole, shots: tuple) -> tuple:
+    return (human.get_pole(), computer.get_pole(), human.count_dead_ships, computer.count_dead_ships,
+            tuple(frozenset(side) for side in shots))
+
+
+def record_game(path: str, seed: int, moving: bool) -> list:
+    """Запись партии с состоянием после каждого хода (снимки для сравнения с воспроизведением)"""
+    game = SeaBattle(10, renderer=NullRenderer(), seed=seed)
+    game.init()
+
+    def live():
+        return snapshot(game.human, game.computer, (game.get_shots(game.human), game.get_shots(game.computer)))
+
+    states = [live()]
+
+    class Writer(GameLogWriter):
+        def shot(self, *args):
+            super().shot(*args)
+            states.append(live())
+
+        def moves(self, *args):
+            super().moves(*args)
+            states[-1] = live()  # перемещения относятся к последнему ходу
+
+    with Writer(path, game, keyframe_interval=7) as log:
+        game.play(DensityShooter(10, rng=game.rng), RandomShooter(10, rng=game.rng), moving=moving, log=log)
+    return states
+
+
+@pytest.mark.parametrize('moving', (False, True))
+@pytest.mark.parametrize('seed', range(4))
+def test_replay_matches_live_game(tmp_path, seed, moving):
+    path = str(tmp_path / 'game.sblog')
+    states = record_game(path, seed, moving)
+    with GameLogReader(path) as reader:
+        assert reader.turns == len(states) - 1
+        assert reader.seed == seed
+        for turn, expected in enumerate(states):
+            state = reader.state_at(turn)
+            assert state.turn == turn
+            assert snapshot(state.human, state.computer, state.shots) == expected
+
+
+def test_record_size():
+    assert RECORD.size == 7
+
+
+def test_invalid_fleet_does_not_create_file(tmp_path):
+    path = tmp_path / 'game.sblog'
+    game = SeaBattle(70, renderer=NullRenderer(), fleet=(65,), seed=1)
+    with pytest.raises(ValueError):
+        GameLogWriter(str(path), game)
+    assert not os.path.exists(path)
+
+
+def test_large_board_log_size(tmp_path):
+    path = str(tmp_path / 'game.sblog')
+    size, turns, interval = 2000, 6000, 64
+    game = SeaBattle(size, renderer=NullRenderer(), seed=2)
+    game.init()
+    shooters = RandomShooter(size, rng=game.rng), RandomShooter(size, rng=game.rng)
+    with GameLogWriter(path, game, keyframe_interval=interval) as log:
+        for turn in range(turns):
+            side = turn % 2
+            gamer = (game.human, game.computer)[side]
+            coord = shooters[side].choose()
+            result, ship = game.shoot(gamer, coord)
+            log.shot(side, coord, result)
+
+    # выстрел записывается записью SHOT и в следующем опорном кадре (если он есть); размер не зависит от поля
+    keyframes = turns // interval + 1
+    ships = len(GamePole.FLEET)
+    expected = (HEADER.size + 4 * ships + turns * RECORD.size + (keyframes - 1) * interval * 4 +
+                keyframes * (RECORD.size + 2 * ships * SHIP.size + 2 * COUNT.size) + 16 * keyframes + FOOTER.size)
+    assert os.path.getsize(path) == expected
+
+    with GameLogReader(path) as reader:
+        state = reader.state_at(turns - 10)
+        assert state.shots[0] | state.shots[1] <= game.get_shots(game.human) | game.get_shots(game.computer)
+        assert len(state.shots[0]) + len(state.shots[1]) == turns - 10
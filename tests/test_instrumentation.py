@@ -0,0 +1,55 @@
+import copy
+import pickle
+
+from instrumentation import NULL_STATS, Stats
+from renderer import NullRenderer
+from SeaBattle import SeaBattle, DensityShooter
+
+
+def test_game_deepcopy():
+    game = SeaBattle(10, renderer=NullRenderer(), seed=3)
+    game.init()
+    game.computer_shoot()
+    clone = copy.deepcopy(game)
+    assert clone.human.get_pole() == game.human.get_pole()
+    assert clone.get_shots(clone.computer) == game.get_shots(game.computer)
+    assert clone.stats is NULL_STATS
+    clone.computer_shoot()
+    assert game.count_shots(game.computer) == 1  # копия независима от исходной партии
+
+
+def test_stats_copy(tmp_path):
+    stats = Stats()
+    game = SeaBattle(10, renderer=NullRenderer(), seed=1, stats=stats)
+    game.init()
+    game.play(DensityShooter(10, rng=game.rng), DensityShooter(10, rng=game.rng))
+    stats.start_dump(str(tmp_path / 'stats.jsonl'), interval=60)
+    try:
+        clone = pickle.loads(pickle.dumps(game))
+    finally:
+        stats.stop_dump()
+    assert clone.stats.snapshot()['counters'] == stats.snapshot()['counters']
+
+
+def test_game_counters_and_timers():
+    stats = Stats()
+    game = SeaBattle(10, renderer=NullRenderer(), fleet=(1,) * 25, seed=2, stats=stats)
+    game.init()  # плотный флот расставляется с перезапусками
+    for coord in (0, 0), (1, 0), (2, 0):
+        game.turn(coord, moving=True)
+    snapshot = stats.snapshot()
+    counters, timers = snapshot['counters'], snapshot['timers']
+    assert counters['init.calls'] == 2
+    assert counters['init.restarts'] == game.human.placement_restarts + game.computer.placement_restarts > 0
+    assert counters['move.moved'] > 0
+    assert timers['init']['count'] == 2
+    assert timers['move_ships']['count'] == 6  # оба поля после каждого из трех ходов
+    assert timers['turn']['count'] == 3
+    assert timers['turn']['max_us'] >= timers['turn']['p50_us'] > 0
+
+
+def test_null_stats_collect_nothing():
+    game = SeaBattle(10, renderer=NullRenderer(), seed=2)
+    game.init()
+    game.turn((0, 0), moving=True)
+    assert NULL_STATS.snapshot() == {'counters': {}, 'timers': {}}
@@ -0,0 +1,40 @@
+import random
+
+import batch
+from layoutpool import LayoutPool
+from renderer import NullRenderer
+from SeaBattle import GamePole
+
+
+def place(layout: tuple) -> GamePole:
+    pole = GamePole(10, renderer=NullRenderer(), rng=random.Random(0))
+    pole.init(layout)  # неправильная расстановка вызывает ValueError
+    return pole
+
+
+def test_take_and_reopen(tmp_path):
+    path = str(tmp_path / 'layouts.pool')
+    with LayoutPool(path, capacity=16, seed=1, background=False) as pool:
+        assert pool.refill(10) == 10
+        layout = pool.take()
+        place(layout)
+        assert len(pool) == 9 and pool.served == 1 and pool.misses == 0
+    with LayoutPool(path, capacity=16, background=False) as pool:
+        assert len(pool) == 9  # готовые расстановки сохраняются в файле
+        assert pool.take() != layout
+
+
+def test_empty_pool_generates_without_lock(tmp_path, monkeypatch):
+    pool = LayoutPool(str(tmp_path / 'layouts.pool'), capacity=16, seed=1, background=False)
+    generate = batch.generate_layouts
+
+    def unlocked_generate(*args):
+        assert not pool._lock.locked()  # пополнение и другие выдачи не ждут генерации на месте
+        return generate(*args)
+
+    monkeypatch.setattr(batch, 'generate_layouts', unlocked_generate)
+    try:
+        place(pool.take())
+        assert pool.misses == 1 and pool.served == 0
+    finally:
+        pool.close()
@@ -0,0 +1,34 @@
+import builtins
+import io
+
+from renderer import AnsiRenderer, ConsoleRenderer, column_label
+from SeaBattle import SeaBattle
+
+CLEAR = '\x1b[2J'
+
+
+def test_column_label():
+    assert [column_label(i) for i in (0, 25, 26, 27, 701, 702)] == ['a', 'z', 'aa', 'ab', 'zz', 'aaa']
+
+
+def test_turns_redraw_only_changes(monkeypatch):
+    stream = io.StringIO()
+    game = SeaBattle(10, renderer=AnsiRenderer(stream), seed=6)
+    game.init()
+    cells = iter(SeaBattle.format_coord((x, y)) for y in range(10) for x in range(10))
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': next(cells))
+    frames = []
+    for _ in range(10):
+        for go in game.human_go, game.computer_go:
+            start = stream.tell()
+            go()
+            frames.append(stream.getvalue()[start:])
+    assert CLEAR in frames[0]
+    assert not any(CLEAR in frame for frame in frames[1:])
+    assert all(len(frame) < len(frames[0]) for frame in frames[1:])
+
+
+def test_console_frame():
+    stream = io.StringIO()
+    ConsoleRenderer(stream).show_board(((0, 1), (2, 0)), 'T')
+    assert stream.getvalue().splitlines()[1:4] == ['a b', '---', '0 1  1']
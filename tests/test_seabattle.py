@@ -0,0 +1,263 @@
+import copy
+import pickle
+import random
+
+import pytest
+
+from instrumentation import Stats
+from renderer import NullRenderer
+from SeaBattle import (BitBoard, GamePole, GridBoard, SparseBoard, SeaBattle, DensityShooter, Event, HuntShooter,
+                       RandomShooter, Ship, Shooter)
+
+
+def test_default_rng_copy():
+    pole = GamePole(10, renderer=NullRenderer())
+    pole.init()
+    assert copy.deepcopy(pole).get_pole() == pole.get_pole()
+    game = SeaBattle(10, renderer=NullRenderer())
+    game.init()
+    clone = pickle.loads(pickle.dumps(game))
+    assert clone.computer.get_layout() == game.computer.get_layout()
+    assert clone.rng is game.rng  # генератор модуля random остается общим
+    pickle.loads(pickle.dumps(RandomShooter(10))).choose()
+
+
+def test_default_rng_follows_random_seed():
+    layouts = []
+    for _ in range(2):
+        random.seed(5)
+        pole = GamePole(10, renderer=NullRenderer())
+        pole.init()
+        layouts.append(pole.get_layout())
+    assert layouts[0] == layouts[1]
+
+
+@pytest.mark.parametrize('board', (GridBoard, BitBoard, SparseBoard))
+def test_pole_pickle_round_trip(board):
+    game = SeaBattle(10, renderer=NullRenderer(), board=board, seed=2)
+    game.init()
+    game.play(DensityShooter(10, rng=game.rng), DensityShooter(10, rng=game.rng), moving=True)
+    pole = game.human
+    view = pole.view()
+    clone = pickle.loads(pickle.dumps(pole))
+    assert clone.get_pole() == pole.get_pole()
+    assert clone.view().tolist() == view.tolist()
+    assert clone.get_layout() == pole.get_layout()
+    x, y = pole.ships[0].get_start_coords()
+    assert clone.get_ship_part((x, y))[2] == 0
+    clone.move_ships()  # копия живет своей жизнью, исходное поле и его представление не меняются
+    assert view.tolist() == [list(row) for row in pole.get_pole()]
+
+
+def test_events_carry_ship_numbers():
+    game = SeaBattle(10, renderer=NullRenderer(), seed=6)
+    events = []
+    game.subscribe(events.append)
+    game.init()
+    winner = game.play(DensityShooter(10, rng=game.rng), DensityShooter(10, rng=game.rng), moving=True)
+    for event in events:
+        if event.kind in (Event.HIT, Event.SUNK):
+            assert event.pole.get_ship_part(event.coord)[2] == event.ship  # подбитые корабли не перемещаются
+    assert [event.pole for event in events if event.kind == Event.GAME_OVER] == [winner]
+
+
+@pytest.mark.parametrize('board', (BitBoard, SparseBoard))
+@pytest.mark.parametrize('seed', range(5))
+def test_boards_agree_with_grid(board, seed):
+    games = {}
+    for kind in GridBoard, board:
+        game = SeaBattle(10, renderer=NullRenderer(), board=kind, seed=seed)
+        game.init()
+        game.play(DensityShooter(10, rng=game.rng), RandomShooter(10, rng=game.rng), moving=True)
+        games[kind] = game
+    grid, other = games[GridBoard].human, games[board].human
+    assert other.get_pole() == grid.get_pole()
+    for x in range(8):
+        for y in range(8):
+            for tp in 1, 2:
+                assert bool(other._board.check_around(3, (x, y), tp)) == bool(grid._board.check_around(3, (x, y), tp))
+            rect = x, y, x + 2, y + (x % 3)
+            assert other._board.is_empty(*rect) == grid._board.is_empty(*rect)
+
+
+@pytest.mark.parametrize('coord', ((10, 0), (0, 10), (-1, 3), (50, 50), None, (1,), 'a1'))
+def test_shoot_rejects_bad_coords(coord):
+    game = SeaBattle(10, renderer=NullRenderer(), seed=1)
+    game.init()
+    with pytest.raises(ValueError):
+        game.shoot(game.human, coord)
+    assert game.count_shots(game.human) == 0
+
+
+def test_shoot_repeated_coords():
+    game = SeaBattle(10, renderer=NullRenderer(), seed=1)
+    game.init()
+    game.shoot(game.human, [3, 4])
+    with pytest.raises(ValueError):
+        game.shoot(game.human, (3, 4))
+    assert game.get_shots(game.human) == {(3, 4)}
+
+
+def solo_game(shooter: Shooter, game: SeaBattle, check=None) -> int:
+    """Стрельба стратегии shooter по полю человека до уничтожения всех кораблей, возвращает число выстрелов"""
+    while not game.human:
+        coord = shooter.choose()
+        if check is not None:
+            check(shooter, coord)
+        result, ship = game.shoot(game.human, coord)
+        shooter.report(coord, result, ship)
+    return game.count_shots(game.human)
+
+
+def test_density_shooter_takes_densest_cell():
+    def check(shooter, coord):
+        if not shooter._hits:  # поиск: выбранная клетка - первая с наибольшей плотностью
+            unknown = [i for i, value in enumerate(shooter._state) if value == shooter.UNKNOWN]
+            assert coord[1] * 10 + coord[0] == max(unknown, key=shooter._density.__getitem__)
+
+    rng = random.Random(2)
+    for _ in range(10):
+        game = SeaBattle(10, renderer=NullRenderer(), rng=rng)
+        game.init()
+        solo_game(DensityShooter(10, rng=rng), game, check)
+
+
+def test_density_shooter_median():
+    rng = random.Random(0)
+    shots = []
+    for _ in range(100):
+        game = SeaBattle(10, renderer=NullRenderer(), rng=rng)
+        game.init()
+        shots.append(solo_game(DensityShooter(10, rng=rng), game))
+    assert sorted(shots)[50] <= 56
+
+
+def test_hunt_shooter_finishes_hit_ships():
+    game = SeaBattle(80, renderer=NullRenderer(), seed=3)
+    game.init()
+    shooter = HuntShooter(80, rng=game.rng)
+    first_hit = None
+    while not game.human:
+        coord = shooter.choose()
+        result, ship = game.shoot(game.human, coord)
+        shooter.report(coord, result, ship)
+        shots = game.count_shots(game.human)
+        if result == SeaBattle.HIT and first_hit is None:
+            first_hit = shots
+        elif result == SeaBattle.SUNK and ship.length > 1:
+            # после первого попадания: палубы корабля, до трех промахов по сторонам и один за его концом
+            assert shots - first_hit <= ship.length + 3
+            first_hit = None
+
+
+def test_ship_cells_read_only():
+    ship = Ship(3)
+    ship[1] = 2
+    assert ship._cells == [1, 2, 1]
+    with pytest.raises(TypeError):
+        ship._cells[0] = 2
+    with pytest.raises(AttributeError):
+        ship._cells = [2, 2, 2]
+    assert ship._cells == [1, 2, 1] and ship
+
+
+def test_game_state_follows_game():
+    game = SeaBattle(10, renderer=NullRenderer(), seed=8)
+    game.init()
+    shooters = DensityShooter(10, rng=game.rng), DensityShooter(10, rng=game.rng)
+    for _ in range(30):  # состояние снимается с середины партии
+        for gamer, shooter in zip((game.human, game.computer), shooters):
+            coord = shooter.choose()
+            shooter.report(coord, *game.shoot(gamer, coord))
+
+    state = game.fork()
+    copy_state = state.fork()
+    shots = []
+    while not (game.human or game.computer):
+        for side, (gamer, shooter) in enumerate(zip((game.human, game.computer), shooters)):
+            coord = shooter.choose()
+            result, ship = game.shoot(gamer, coord)
+            shooter.report(coord, result, ship)
+            assert state.apply_shot(side, coord) == result
+            shots.append(side)
+            if gamer:
+                break
+    assert state.winner == (0 if game.human else 1)
+    assert state.count_shots(0) == game.count_shots(game.human)
+    assert state.dead_ships(1) == game.computer.count_dead_ships
+
+    for _ in shots:
+        state.undo()
+    assert state.count_shots(0) == copy_state.count_shots(0) == 30
+    assert state.remaining_ships(0) == copy_state.remaining_ships(0)
+    assert copy_state.winner is None
+
+
+def assert_legal(pole: GamePole):
+    """Проверка расстановки: корабли в поле, не пересекаются и не касаются (проверяет init(layout))"""
+    check = GamePole(pole.size, renderer=NullRenderer(), fleet=[ship.length for ship in pole.ships])
+    check.init(pole.get_layout())
+    assert check.get_pole() == pole.get_pole()
+
+
+def test_crowded_fleet_restarts():
+    pole = GamePole(10, renderer=NullRenderer(), fleet=(1,) * 25, rng=random.Random(0))
+    pole.init()  # 25 однопалубных - наибольшее количество на поле 10 x 10
+    assert pole.placement_restarts > 0
+    assert_legal(pole)
+    assert sum(map(sum, pole.get_pole())) == 25
+
+
+def test_impossible_fleet_raises():
+    pole = GamePole(3, renderer=NullRenderer(), fleet=(1,) * 5, rng=random.Random(1))
+    with pytest.raises(ValueError):
+        pole.init()
+    assert pole.placement_restarts == GamePole.MAX_PLACEMENT_RESTARTS + 1
+
+
+def test_orientation_flips_when_no_anchors():
+    # два четырехпалубных на поле 4 x 4 помещаются только параллельно у противоположных краев
+    flipped = 0
+    for seed in range(20):
+        pole = GamePole(4, renderer=NullRenderer(), fleet=(4, 4), rng=random.Random(seed))
+        before = [ship.tp for ship in pole.ships]
+        pole.init()
+        first, second = pole.ships
+        assert first.tp == second.tp
+        assert_legal(pole)
+        flipped += before != [first.tp, second.tp]
+    assert flipped
+
+
+def test_sparse_placement_draw_limit():
+    stats = Stats()
+    pole = GamePole(100, renderer=NullRenderer(), fleet=(1,) * 2500, rng=random.Random(1), stats=stats)
+    with pytest.raises(ValueError):
+        pole.init()  # 2500 однопалубных - плотнейшая упаковка, случайными попытками ее не найти
+    assert stats.snapshot()['counters']['init.sparse_attempts'] == GamePole.MAX_PLACEMENT_DRAWS_PER_SHIP * 2500
+
+
+def test_sparse_placement_fits_in_draw_limit():
+    pole = GamePole(128, renderer=NullRenderer(), fleet=GamePole.FLEET * 160, rng=random.Random(2))
+    pole.init()  # около 20% клеток поля заняты кораблями
+    assert_legal(pole)
+
+
+@pytest.mark.parametrize('coord', ((10, 0), (-1, 3), None, (1,), 'a1'))
+def test_game_state_rejects_bad_coords(coord):
+    game = SeaBattle(10, renderer=NullRenderer(), seed=1)
+    game.init()
+    state = game.fork()
+    with pytest.raises(ValueError):
+        state.apply_shot(0, coord)
+    assert state.count_shots(0) == 0
+
+
+def test_game_state_accepts_list_coords():
+    game = SeaBattle(10, renderer=NullRenderer(), seed=1)
+    game.init()
+    state = game.fork()
+    x, y = game.computer.ships[0].get_start_coords()
+    assert state.apply_shot(0, [x, y]) == game.shoot(game.human, [x, y])[0]
+    with pytest.raises(ValueError):
+        state.apply_shot(0, (x, y))
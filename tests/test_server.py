@@ -0,0 +1,48 @@
+from instrumentation import Stats
+from SeaBattle import SeaBattle
+from server import GameSession
+
+
+def test_session_plays_to_the_end():
+    session = GameSession()  # без перемещений партия заканчивается не позже 100 выстрелов
+    replies = []
+    for y in range(10):
+        for x in range(10):
+            reply = session.handle(SeaBattle.format_coord((x, y))).split()
+            replies.append(reply)
+            if session.finished:
+                break
+        if session.finished:
+            break
+    assert session.finished
+    assert replies[-1][-1] in ('win', 'lose')
+    assert all(reply[0] in ('miss', 'hit', 'sunk') for reply in replies)
+    assert session.handle('a1') == 'error партия окончена'
+    shots = session.handle('shots').split()[1].split('/')
+    assert sum(row.count('X') + row.count('*') for row in shots) == len(replies)
+
+
+def test_session_errors():
+    session = GameSession()
+    assert session.handle('k1') == 'error неверные координаты'
+    session.handle('a1')
+    assert session.handle('a1').startswith('error')
+    assert session.handle('board').startswith('board ')
+
+
+def test_session_stats():
+    stats = Stats()
+    session = GameSession(stats=stats)
+    session.handle('a1')
+    session.handle('k1')  # неверные координаты в таймер хода не попадают
+    session.handle('b1')
+    snapshot = stats.snapshot()
+    assert snapshot['timers']['turn']['count'] == 2
+    assert snapshot['counters']['init.calls'] == 2
+
+
+def test_session_draw():
+    session = GameSession()
+    session._game.computer_shoot = lambda: None  # компьютеру стрелять больше некуда
+    assert session.handle('a1').split()[-1] == 'draw'
+    assert session.finished
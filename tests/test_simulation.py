@@ -0,0 +1,25 @@
+import pytest
+
+from SeaBattle import DensityShooter
+from simulation import simulate
+
+
+def test_workers_give_same_results():
+    one = simulate(60, workers=1, seed=5, chunk_size=20)
+    two = simulate(60, workers=2, seed=5, chunk_size=20)
+    assert one['win_rate'] == two['win_rate']
+    assert one['shots_to_win'] == two['shots_to_win']
+    assert set(one) == {'games', 'seed', 'workers', 'elapsed', 'games_per_sec', 'win_rate', 'shots_to_win'}
+    assert one['games'] == 60 and one['seed'] == 5 and two['workers'] == 2
+    assert sum(one['win_rate'].values()) == pytest.approx(1)
+    assert one['win_rate']['draw'] == 0
+    assert sum(sum(counter.values()) for counter in one['shots_to_win'].values()) == 60
+
+
+def test_draws():
+    stats = simulate(20, workers=1, seed=1, human=DensityShooter, computer=DensityShooter, moving=True)
+    rates = stats['win_rate']
+    assert rates['draw'] > 0  # перемещенные корабли могут оказаться в уже обстрелянных клетках
+    assert sum(rates.values()) == pytest.approx(1)
+    wins = sum(sum(counter.values()) for counter in stats['shots_to_win'].values())
+    assert wins == round((rates['human'] + rates['computer']) * 20)
@@ -0,0 +1,71 @@
+import io
+import json
+
+import pytest
+
+from SeaBattle import SeaBattle
+from stream import CoordTable, StreamPlayer
+
+
+def all_cells(size: int = 10) -> list:
+    return [SeaBattle.format_coord((x, y)) for y in range(size) for x in range(size)]
+
+
+def test_coord_table():
+    table = CoordTable(30)
+    for coord in (0, 0), (25, 3), (26, 29), (29, 29):
+        assert table.parse(table.format(coord)) == coord
+    assert table.parse('zz1') is None
+
+
+def test_game_matches_turn():
+    player = StreamPlayer(seed=6, moving=True)
+    out = io.StringIO()
+    summary = player.run(['new'] + all_cells() + ['quit'], out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    game = SeaBattle(10, seed=6)
+    game.init()
+    for record in records:
+        if 'error' in record:
+            break
+        result, reply, winner = game.turn(game.parse_coord(record['shot']), moving=True)
+        assert record['result'] == ('miss', 'hit', 'sunk')[result]
+        assert record.get('reply') == (game.format_coord(reply[0]) if reply else None)
+        assert record.get('over') == (None if winner is None else 'draw' if winner is game.DRAW else
+                                      'win' if winner is game.human else 'lose')
+    assert summary['games'] == 1 and summary['wins'] + summary['losses'] == 1 and summary['draws'] == 0
+
+
+def test_draw():
+    # перемещенные корабли оказываются в обстрелянных клетках, и человеку больше некуда стрелять
+    player = StreamPlayer(seed=4, moving=True, fmt='text')
+    out = io.StringIO()
+    summary = player.run(['new'] + all_cells() + ['quit'], out)
+    lines = out.getvalue().splitlines()
+    assert summary == {'games': 1, 'wins': 0, 'losses': 0, 'draws': 1}
+    assert lines[-1].endswith(' draw') and len(lines) == 100
+
+
+def test_errors():
+    player = StreamPlayer(fmt='text')
+    assert player.handle('# comment') is None
+    assert player.handle('zz99').endswith('неверные координаты')
+    assert player.handle('new x').endswith('неверное зерно')
+    player.handle('a1')
+    assert player.handle('a1').startswith('1 error')
+
+
+def test_pool_rejects_seed():
+    with pytest.raises(ValueError):
+        StreamPlayer(seed=1, pool=object())
+    player = StreamPlayer(pool=object())
+    assert 'error' in json.loads(player.handle('new 5'))
+
+
+@pytest.mark.parametrize('size', (10, 300))
+def test_leading_zeros(size):
+    player = StreamPlayer(size=size, seed=1, fmt='text')
+    assert player.handle('a01').split()[2:3] == ['a01']
+    assert player.handle('b002').split()[2:3] == ['b002']
+    assert player.handle('a1').split()[1] == 'error'  # та же клетка, что и a01